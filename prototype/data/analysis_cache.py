@@ -0,0 +1,101 @@
+# File: prototype/data/analysis_cache.py
+
+import fcntl
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+from prototype.data.dataset_loader import atomic_write
+
+logger = logging.getLogger(__name__)
+
+class AnalysisCache:
+    """Content-addressed on-disk store for EdNetAnalyzer intermediates.
+
+    Entries are keyed by the SHA-256 of the dataset plus the analyzer
+    parameters and stored as compressed .npz archives. File hashes are
+    remembered per (path, size, mtime), so an unchanged file is never
+    re-hashed; updates to that index hold an exclusive lock, so analyzers
+    sharing a cache directory keep each other's entries.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / 'file_hashes.json'
+        self.lock_path = self.cache_dir / 'file_hashes.lock'
+
+    def key(self, data_path: str, params: Dict) -> str:
+        """Cache key for a dataset file and analyzer parameters."""
+        payload = json.dumps({
+            'content': self._content_hash(data_path),
+            'params': params
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load cached arrays, or None on a miss."""
+        entry = self.cache_dir / f"{key}.npz"
+        if not entry.exists():
+            return None
+        try:
+            with np.load(entry, allow_pickle=False) as archive:
+                return {name: archive[name] for name in archive.files}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {entry}: {e}")
+            return None
+
+    def save(self, key: str, arrays: Dict[str, np.ndarray]) -> Path:
+        """Store arrays under a cache key."""
+        entry = self.cache_dir / f"{key}.npz"
+        with atomic_write(entry, suffix='.npz') as tmp_path:
+            np.savez_compressed(tmp_path, **arrays)
+        logger.info(f"Cached analysis results to {entry}")
+        return entry
+
+    def _content_hash(self, data_path: str) -> str:
+        """SHA-256 of a file or store directory, memoized by path, size and mtime."""
+        path = Path(data_path).resolve()
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        stats = [p.stat() for p in files]
+        stamp = f"{sum(s.st_size for s in stats)}:{max((s.st_mtime_ns for s in stats), default=0)}"
+
+        cached = self._read_index().get(str(path))
+        if cached and cached['stamp'] == stamp:
+            return cached['sha256']
+
+        digest = hashlib.sha256()
+        for file_path in files:
+            digest.update(str(file_path.relative_to(path)).encode())
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+
+        # Re-read under the lock so entries added while hashing are kept
+        with self._index_lock():
+            index = self._read_index()
+            index[str(path)] = {'stamp': stamp, 'sha256': digest.hexdigest()}
+            with atomic_write(self.index_path) as tmp_path, open(tmp_path, 'w') as f:
+                json.dump(index, f, indent=2)
+
+        return digest.hexdigest()
+
+    def _read_index(self) -> Dict[str, Dict]:
+        """The file hash index; always complete, as it is replaced atomically."""
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    @contextmanager
+    def _index_lock(self):
+        """Hold an exclusive lock on the index for a read-modify-write."""
+        with open(self.lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
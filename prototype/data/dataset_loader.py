@@ -0,0 +1,162 @@
+# File: prototype/data/dataset_loader.py
+
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from prototype.data.interaction_store import InteractionStore, is_interaction_store
+
+try:
+    import pyarrow  # also required by pandas for Feather I/O
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# Set once the missing-pyarrow warning has been logged
+_warned_no_cache = False
+
+# Compact dtypes for EdNet-style interaction logs
+INTERACTION_SCHEMA: Dict[str, str] = {
+    'user_id': 'int32',
+    'question_id': 'int32',
+    'correct': 'int8',
+    'elapsed_time': 'int32',
+    'knowledge_tag': 'category'
+}
+
+def load_interactions(path: str,
+                      columns: Optional[List[str]] = None,
+                      use_cache: bool = True) -> pd.DataFrame:
+    """Load an interaction CSV with the compact schema.
+
+    When pyarrow is available a Feather copy is kept next to the CSV and
+    read instead of reparsing it, as long as the CSV still has the size and
+    mtime recorded when the copy was made. Without pyarrow a warning is
+    logged once and the CSV is always parsed. ``path`` may also be an
+    interaction store directory, which is opened memory-mapped instead of
+    parsed.
+    """
+    if is_interaction_store(path):
+        logger.info(f"Opening interaction store {path}")
+        return InteractionStore(path).to_frame(columns)
+
+    csv_path = Path(path)
+    cache_path = csv_path.with_suffix('.feather')
+    stamp_path = cache_path.with_name(cache_path.name + '.stamp')
+    if use_cache and not HAS_PYARROW:
+        _warn_no_cache()
+        use_cache = False
+
+    # Taken before parsing, so a CSV changed meanwhile is parsed again next time
+    stamp = _source_stamp(csv_path)
+    if use_cache and cache_path.exists() and _read_stamp(stamp_path) == stamp:
+        logger.info(f"Loading interactions from {cache_path}")
+        return pd.read_feather(cache_path, columns=columns)
+
+    logger.info(f"Parsing interactions from {csv_path}")
+    data = pd.read_csv(csv_path, dtype=_schema_for(csv_path))
+
+    if use_cache:
+        with atomic_write(cache_path) as tmp_path:
+            data.to_feather(tmp_path)
+        with atomic_write(stamp_path) as tmp_path:
+            tmp_path.write_text(stamp)
+        logger.info(f"Cached columnar copy at {cache_path}")
+
+    return data[columns] if columns is not None else data
+
+@contextmanager
+def atomic_write(path: Path, suffix: str = '') -> Iterator[Path]:
+    """Yield a fresh temporary path next to ``path``, moved over it on success.
+
+    Readers never see a partially written file, and concurrent writers each
+    get their own temporary file. ``suffix`` is for writers that insist on
+    a file extension.
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.",
+                                     suffix=suffix, delete=False) as f:
+        tmp_path = Path(f.name)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+class ParquetChunkWriter:
+    """Appends DataFrame chunks to one Parquet file.
+
+    The schema is taken from the first chunk, and the file is only created
+    once that chunk arrives. Raises ImportError up front when pyarrow is
+    not installed.
+    """
+
+    def __init__(self, path: str):
+        if not HAS_PYARROW:
+            raise ImportError("Writing Parquet output requires pyarrow")
+        self.path = path
+        self._writer = None
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self) -> 'ParquetChunkWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def iter_interaction_chunks(path: str,
+                            chunksize: int,
+                            columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Read an interaction CSV (or store directory) in chunks with the compact schema."""
+    if is_interaction_store(path):
+        store = InteractionStore(path)
+        return (store.to_frame(columns, rows=slice(start, start + chunksize))
+                for start in range(0, len(store), chunksize))
+
+    return pd.read_csv(
+        path,
+        usecols=columns,
+        dtype=_schema_for(Path(path)),
+        chunksize=chunksize
+    )
+
+def _schema_for(csv_path: Path) -> Dict[str, str]:
+    """Schema entries for the columns actually present in the CSV."""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    return {col: dtype for col, dtype in INTERACTION_SCHEMA.items() if col in header}
+
+def _source_stamp(source_path: Path) -> str:
+    """Size and modification time of a file, as ``AnalysisCache`` stamps them."""
+    stat = source_path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def _read_stamp(stamp_path: Path) -> Optional[str]:
+    """The stamp recorded for a cached copy, or None if there is none."""
+    try:
+        return stamp_path.read_text()
+    except FileNotFoundError:
+        return None
+
+def _warn_no_cache() -> None:
+    """Log once per process that the Feather cache is off."""
+    global _warned_no_cache
+    if not _warned_no_cache:
+        logger.warning("pyarrow is not installed; interaction CSVs are parsed on "
+                       "every load (install pyarrow to enable the Feather cache)")
+        _warned_no_cache = True
@@ -2,29 +2,83 @@
 
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from pathlib import Path
+from contextlib import contextmanager
+import gc
 import json
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Tuple, Optional, Iterable
 import logging
 from collections import defaultdict
+from prototype.data.analysis_cache import AnalysisCache
+from prototype.data.dataset_loader import load_interactions, iter_interaction_chunks
 
 logger = logging.getLogger(__name__)
 
+MOMENT_NAMES = ('n', 'sum_x', 'sum_xx', 'sum_xy')
+
 class EdNetAnalyzer:
-    """Analyzes EdNet-KT1 dataset to extract knowledge structure."""
+    """Analyzes EdNet-KT1 dataset to extract knowledge structure.
+    
+    The analysis is backed by sufficient statistics (per-tag totals,
+    per-user tag sums, tag-pair moments and transition counts), so new
+    interaction logs can be folded in with ``update`` instead of
+    re-analyzing the full history.
+    """
+    
+    # Bump when the cached intermediates change meaning
+    CACHE_VERSION = 3
     
-    def __init__(self, ednet_path: str):
+    def __init__(self, ednet_path: str, cache_dir: Optional[str] = None):
         self.ednet_path = ednet_path
+        self.cache = AnalysisCache(cache_dir) if cache_dir else None
         self.data = None
+        self.structure = None
+        self._reset_statistics()
+    
+    def _reset_statistics(self) -> None:
+        """Clear analysis results and the statistics behind them."""
         self.knowledge_tags = set()
         self.concept_relationships = defaultdict(lambda: defaultdict(float))
         self.success_rates = {}
         self.prerequisite_strengths = defaultdict(lambda: defaultdict(float))
         
+        self.tag_labels = pd.Index([])
+        self.user_labels = pd.Index([])
+        self.tag_totals = None
+        self.transition_counts = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self.total_transitions = 0
+        self.user_last_tag = np.empty(0, dtype=np.int64)
+        self.user_tag_correct = sparse.csr_matrix((0, 0))
+        self.user_tag_counts = sparse.csr_matrix((0, 0))
+        self.pair_moments = {name: np.zeros((0, 0)) for name in MOMENT_NAMES}
+        self.prerequisite_correlations = None
+        self.prerequisite_co_users = None
+        self.prerequisite_matrix = np.zeros((0, 0))
+        self._encoded = None
+        
     def analyze_structure(self) -> Dict:
         """Extract knowledge structure from EdNet data."""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(self.ednet_path, self._cache_params())
+            cached = self.cache.load(cache_key)
+            if cached is not None:
+                logger.info("Loaded EdNet analysis from cache")
+                # Everything rebuilt here is acyclic, so pausing the collector
+                # saves the repeated full collections triggered by allocating
+                # millions of small dicts
+                with _gc_paused():
+                    self._restore_state(cached)
+                    self.structure = _build_structure(_object_labels(self.tag_labels), {
+                        name[len('structure_'):]: cached[name]
+                        for name in cached if name.startswith('structure_')
+                    })
+                return self.structure
+        
         logger.info("Loading EdNet data...")
-        self.data = pd.read_csv(self.ednet_path)
+        self._reset_statistics()
+        self.data = load_interactions(self.ednet_path)
         
         # Extract unique knowledge tags
         self.knowledge_tags = set(self.data['knowledge_tag'].unique())
@@ -39,121 +93,400 @@ class EdNetAnalyzer:
         self._analyze_prerequisites()
         
         # Generate topic structure
-        structure = self._generate_topic_structure()
+        structure_arrays = self._topic_structure_arrays()
+        self.structure = _build_structure(_object_labels(self.tag_labels), structure_arrays)
         
-        return structure
+        if cache_key is not None:
+            state = self._export_state()
+            for name, array in structure_arrays.items():
+                state[f"structure_{name}"] = array
+            self.cache.save(cache_key, state)
+        
+        return self.structure
     
-    def _calculate_success_rates(self) -> None:
-        """Calculate success rates for each concept."""
-        for tag in self.knowledge_tags:
-            tag_data = self.data[self.data['knowledge_tag'] == tag]
+    def update(self, new_rows: pd.DataFrame) -> Dict:
+        """Fold newly arrived interactions into the analysis.
+        
+        Only ``new_rows`` are scanned: tag totals, per-user tag sums,
+        tag-pair moments and transition counts are updated in place and the
+        topic structure is regenerated. New rows are taken to follow each
+        user's existing history.
+        """
+        logger.info(f"Updating analysis with {len(new_rows)} new interactions...")
+        
+        self._calculate_success_rates([new_rows])
+        
+        user_codes, tag_codes = self._encode_rows(new_rows)
+        self.knowledge_tags.update(self.tag_labels)
+        
+        self._count_transitions(user_codes, tag_codes, new_rows['elapsed_time'].to_numpy())
+        self._set_concept_relationships()
+        
+        self._accumulate_user_tag_statistics(user_codes, tag_codes, new_rows['correct'])
+        self._set_prerequisite_strengths()
+        
+        self.structure = self._generate_topic_structure()
+        return self.structure
+    
+    def calculate_success_rates_streaming(self, chunksize: int = 1_000_000) -> Dict:
+        """Build per-concept success rates from the CSV in chunks.
+        
+        Only the partial aggregates are held in memory, so this works on
+        files larger than RAM.
+        """
+        logger.info(f"Streaming tag statistics in chunks of {chunksize} rows...")
+        chunks = iter_interaction_chunks(
+            self.ednet_path,
+            chunksize,
+            columns=['knowledge_tag', 'correct', 'elapsed_time']
+        )
+        self.tag_totals = None
+        self._calculate_success_rates(chunks)
+        self.knowledge_tags = set(self.success_rates)
+        return self.success_rates
+    
+    def _calculate_success_rates(self, chunks: Optional[Iterable[pd.DataFrame]] = None) -> None:
+        """Calculate success rates for each concept.
+        
+        Uses one grouped aggregation per chunk (the loaded data by default)
+        and merges the partial sums into ``tag_totals``, so every row is
+        visited once.
+        """
+        if chunks is None:
+            chunks = [self.data]
+        
+        for chunk in chunks:
+            partial = self._aggregate_tag_statistics(chunk)
+            if self.tag_totals is None:
+                self.tag_totals = partial
+            else:
+                self.tag_totals = self.tag_totals.add(partial, fill_value=0)
+        
+        if self.tag_totals is not None:
+            self._set_success_rates()
+    
+    def _set_success_rates(self) -> None:
+        """Derive success rates from the accumulated tag totals."""
+        totals = self.tag_totals
+        correct_rate = totals['correct_sum'] / totals['correct_count']
+        avg_time = totals['time_sum'] / totals['time_count']
+        for tag in totals.index:
             self.success_rates[tag] = {
-                'correct_rate': tag_data['correct'].mean(),
-                'attempts': len(tag_data),
-                'avg_time': tag_data['elapsed_time'].mean()
+                'correct_rate': correct_rate[tag],
+                'attempts': int(totals.at[tag, 'attempts']),
+                'avg_time': avg_time[tag]
             }
     
+    @staticmethod
+    def _aggregate_tag_statistics(data: pd.DataFrame) -> pd.DataFrame:
+        """Partial sums and counts per knowledge tag for a block of rows."""
+        tags = data['knowledge_tag']
+        if not isinstance(tags.dtype, pd.CategoricalDtype):
+            tags = tags.astype('category')
+        
+        grouped = data[['correct', 'elapsed_time']].groupby(tags, observed=True)
+        partial = grouped.agg(
+            correct_sum=('correct', 'sum'),
+            correct_count=('correct', 'count'),
+            time_sum=('elapsed_time', 'sum'),
+            time_count=('elapsed_time', 'count')
+        )
+        partial['attempts'] = grouped.size()
+        # Plain index so partials from chunks with different categories align
+        partial.index = partial.index.astype(object)
+        return partial.astype(np.float64)
+    
     def _analyze_concept_relationships(self) -> None:
         """Analyze relationships between concepts based on transitions."""
-        total_transitions = 0
+        user_codes, tag_codes = self._encode_interactions()
+        self._count_transitions(user_codes, tag_codes, self.data['elapsed_time'].to_numpy())
+        self._set_concept_relationships()
+    
+    def _count_transitions(self,
+                           user_codes: np.ndarray,
+                           tag_codes: np.ndarray,
+                           elapsed_time: np.ndarray) -> None:
+        """Add the concept transitions of a block of rows to transition_counts."""
+        n_tags = len(self.tag_labels)
+        n_users = len(self.user_labels)
+        last_tag = np.full(n_users, -1, dtype=np.int64)
+        last_tag[:len(self.user_last_tag)] = self.user_last_tag
         
-        # Analyze transitions between concepts
-        for _, user_data in self.data.groupby('user_id'):
-            user_data = user_data.sort_values('elapsed_time')
-            prev_tag = None
-            
-            for tag in user_data['knowledge_tag']:
-                if prev_tag is not None and prev_tag != tag:
-                    self.concept_relationships[prev_tag][tag] += 1
-                    total_transitions += 1
-                prev_tag = tag
-        
-        # Normalize relationship strengths
-        if total_transitions > 0:
-            for tag1 in self.concept_relationships:
-                for tag2 in self.concept_relationships[tag1]:
-                    self.concept_relationships[tag1][tag2] /= total_transitions
+        # Continue each known user's sequence from their last recorded concept
+        batch_users = np.unique(user_codes)
+        continuing = batch_users[last_tag[batch_users] >= 0]
+        users = np.concatenate([continuing, user_codes])
+        sequence = np.concatenate([last_tag[continuing], tag_codes])
+        times = np.concatenate([
+            np.full(len(continuing), -np.inf),
+            elapsed_time.astype(np.float64)
+        ])
+        
+        # One stable global sort replaces the per-user sort_values copies
+        order = np.lexsort((times, users))
+        users = users[order]
+        sequence = sequence[order]
+        
+        # Consecutive rows of the same user with a change of concept
+        is_transition = (users[1:] == users[:-1]) & (sequence[1:] != sequence[:-1])
+        from_tags = sequence[:-1][is_transition]
+        to_tags = sequence[1:][is_transition]
+        
+        batch_counts = sparse.coo_matrix(
+            (np.ones(len(from_tags), dtype=np.int64), (from_tags, to_tags)),
+            shape=(n_tags, n_tags)
+        ).tocsr()
+        self.transition_counts = _resize_sparse(self.transition_counts, (n_tags, n_tags)) + batch_counts
+        self.total_transitions += len(from_tags)
+        
+        is_last = np.append(users[1:] != users[:-1], True) if len(users) else np.zeros(0, bool)
+        last_tag[users[is_last]] = sequence[is_last]
+        self.user_last_tag = last_tag
+    
+    def _set_concept_relationships(self) -> None:
+        """Fill normalized relationship strengths from the transition counts."""
+        if self.total_transitions > 0:
+            strengths = self.transition_counts.tocoo()
+            _fill_nested(self.concept_relationships, _object_labels(self.tag_labels),
+                         strengths.row, strengths.col, strengths.data / self.total_transitions)
+    
+    def _encode_interactions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Integer-encode user ids and knowledge tags of the loaded data (cached)."""
+        if self._encoded is None:
+            self._encoded = self._encode_rows(self.data)
+        return self._encoded
+    
+    def _encode_rows(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Map user ids and tags to integer codes, registering unseen labels."""
+        self.user_labels, user_codes = _extend_labels(self.user_labels, data['user_id'])
+        self.tag_labels, tag_codes = _extend_labels(self.tag_labels, data['knowledge_tag'])
+        return user_codes, tag_codes
     
     def _analyze_prerequisites(self) -> None:
         """Analyze prerequisite relationships through performance patterns."""
-        for tag in self.knowledge_tags:
-            tag_users = set(self.data[self.data['knowledge_tag'] == tag]['user_id'])
-            
-            for potential_prereq in self.knowledge_tags:
-                if potential_prereq != tag:
-                    prereq_success = []
-                    tag_success = []
-                    
-                    for user_id in tag_users:
-                        user_data = self.data[self.data['user_id'] == user_id]
-                        
-                        # Get success rates before attempting the target concept
-                        prereq_attempts = user_data[
-                            user_data['knowledge_tag'] == potential_prereq
-                        ]['correct'].tolist()
-                        
-                        tag_attempts = user_data[
-                            user_data['knowledge_tag'] == tag
-                        ]['correct'].tolist()
-                        
-                        if prereq_attempts and tag_attempts:
-                            prereq_success.append(np.mean(prereq_attempts))
-                            tag_success.append(np.mean(tag_attempts))
-                    
-                    if prereq_success and tag_success:
-                        # Calculate correlation between prerequisite success and concept success
-                        correlation = np.corrcoef(prereq_success, tag_success)[0,1]
-                        self.prerequisite_strengths[tag][potential_prereq] = max(0, correlation)
+        user_codes, tag_codes = self._encode_interactions()
+        self._accumulate_user_tag_statistics(user_codes, tag_codes, self.data['correct'])
+        self._set_prerequisite_strengths()
+    
+    def _set_prerequisite_strengths(self) -> None:
+        """Fill prerequisite strengths from the tag-pair correlation matrix.
+        
+        ``prerequisite_matrix[i, j]`` is the strength of tag ``j`` as a
+        prerequisite of tag ``i``; pairs no user attempted together are 0.
+        """
+        n_tags = len(self.tag_labels)
+        correlations = self.prerequisite_correlations.T
+        observed = (self.prerequisite_co_users.T > 0) & ~np.eye(n_tags, dtype=bool)
+        
+        # Undefined correlations (constant or single-user samples) count as 0
+        self.prerequisite_matrix = np.where(observed, np.fmax(correlations, 0.0), 0.0)
+        
+        tags, prereqs = np.nonzero(observed)
+        _fill_nested(self.prerequisite_strengths, _object_labels(self.tag_labels),
+                     tags, prereqs, self.prerequisite_matrix[tags, prereqs])
+    
+    def _accumulate_user_tag_statistics(self,
+                                        user_codes: np.ndarray,
+                                        tag_codes: np.ndarray,
+                                        correct: pd.Series) -> None:
+        """Fold a block of rows into the user x tag sums and tag-pair moments.
+        
+        Only the users present in the block change their per-tag accuracy,
+        so their old contribution to the pair moments is swapped for the new.
+        """
+        shape = (len(self.user_labels), len(self.tag_labels))
+        
+        grouped = (pd.DataFrame({
+                'user': user_codes,
+                'tag': tag_codes,
+                'correct': correct.to_numpy(dtype=np.float64)
+            })
+            .groupby(['user', 'tag'], sort=False)['correct']
+            .agg(['sum', 'count']))
+        
+        rows = grouped.index.get_level_values('user').to_numpy()
+        cols = grouped.index.get_level_values('tag').to_numpy()
+        batch_correct = sparse.csr_matrix((grouped['sum'].to_numpy(), (rows, cols)), shape=shape)
+        batch_counts = sparse.csr_matrix(
+            (grouped['count'].to_numpy(dtype=np.float64), (rows, cols)), shape=shape
+        )
+        
+        correct_sums = _resize_sparse(self.user_tag_correct, shape)
+        counts = _resize_sparse(self.user_tag_counts, shape)
+        affected = np.unique(rows)
+        before = self._pair_moments(correct_sums[affected], counts[affected])
+        
+        self.user_tag_correct = correct_sums + batch_correct
+        self.user_tag_counts = counts + batch_counts
+        after = self._pair_moments(self.user_tag_correct[affected], self.user_tag_counts[affected])
+        
+        n_tags = shape[1]
+        for name in MOMENT_NAMES:
+            moment = np.zeros((n_tags, n_tags))
+            previous = self.pair_moments[name]
+            moment[:previous.shape[0], :previous.shape[1]] = previous
+            self.pair_moments[name] = moment + after[name] - before[name]
+        
+        self.prerequisite_correlations, self.prerequisite_co_users = (
+            self._correlations_from_moments(self.pair_moments)
+        )
+    
+    @staticmethod
+    def _pair_moments(correct_sums: sparse.csr_matrix,
+                      counts: sparse.csr_matrix) -> Dict[str, np.ndarray]:
+        """Co-user counts, sums, squares and cross-products for every tag pair.
+        
+        Entry [j, i] of each moment runs over the users who attempted both
+        tag j and tag i; ``sum_x`` and ``sum_xx`` are taken over tag j's
+        per-user accuracy.
+        """
+        presence = counts.copy()
+        presence.eliminate_zeros()
+        presence.data = np.ones_like(presence.data)
+        reciprocal = counts.copy()
+        reciprocal.eliminate_zeros()
+        reciprocal.data = 1.0 / reciprocal.data
+        accuracy = correct_sums.multiply(reciprocal).tocsr()
+        
+        return {
+            'n': (presence.T @ presence).toarray(),
+            'sum_x': (accuracy.T @ presence).toarray(),
+            'sum_xx': (accuracy.multiply(accuracy).T @ presence).toarray(),
+            'sum_xy': (accuracy.T @ accuracy).toarray()
+        }
+    
+    @staticmethod
+    def _correlations_from_moments(moments: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Pearson correlation of per-user accuracy for every tag pair at once.
+        
+        Entry [j, i] correlates accuracy on tag j with accuracy on tag i over
+        the users who attempted both. Returns the correlation matrix (NaN where
+        undefined) and the matrix of co-user counts.
+        """
+        n, sum_x, sum_xx, sum_xy = (moments[name] for name in MOMENT_NAMES)
+        # The transposes hold the same sums for the second tag of each pair
+        sum_y, sum_yy = sum_x.T, sum_xx.T
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sum_xy - sum_x * sum_y / n
+            var_x = sum_xx - sum_x ** 2 / n
+            var_y = sum_yy - sum_y ** 2 / n
+            # Treat cancellation residue as zero variance, as np.corrcoef would
+            var_x[var_x <= 1e-12 * sum_xx] = 0.0
+            var_y[var_y <= 1e-12 * sum_yy] = 0.0
+            denominator = np.sqrt(var_x * var_y)
+            denominator[denominator == 0] = np.nan
+            correlations = np.clip(cov / denominator, -1.0, 1.0)
+        
+        return correlations, n
+    
+    def _cache_params(self) -> Dict:
+        """Analyzer parameters that the cached intermediates depend on."""
+        return {
+            'analyzer': type(self).__name__,
+            'version': self.CACHE_VERSION,
+            'transition_order': 'elapsed_time'
+        }
+    
+    def _export_state(self) -> Dict[str, np.ndarray]:
+        """Sufficient statistics as plain arrays, for the analysis cache."""
+        totals = self.tag_totals.reindex(self.tag_labels)
+        state = {
+            'tags': _label_array(self.tag_labels),
+            'users': _label_array(self.user_labels),
+            'total_transitions': np.array(self.total_transitions),
+            'user_last_tag': self.user_last_tag
+        }
+        for column in totals.columns:
+            state[f"totals_{column}"] = totals[column].to_numpy()
+        for name in MOMENT_NAMES:
+            state[f"moment_{name}"] = self.pair_moments[name]
+        for name in ('transition_counts', 'user_tag_correct', 'user_tag_counts'):
+            matrix = getattr(self, name)
+            state[f"{name}_data"] = matrix.data
+            state[f"{name}_indices"] = matrix.indices
+            state[f"{name}_indptr"] = matrix.indptr
+        return state
+    
+    def _restore_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Rebuild analysis results from cached sufficient statistics."""
+        self._reset_statistics()
+        self.tag_labels = pd.Index(state['tags'].tolist())
+        self.user_labels = pd.Index(state['users'].tolist())
+        self.knowledge_tags = set(self.tag_labels)
+        
+        self.tag_totals = pd.DataFrame({
+            name[len('totals_'):]: state[name]
+            for name in state if name.startswith('totals_')
+        }, index=pd.Index(self.tag_labels, dtype=object))
+        self._set_success_rates()
+        
+        n_tags, n_users = len(self.tag_labels), len(self.user_labels)
+        shapes = {
+            'transition_counts': (n_tags, n_tags),
+            'user_tag_correct': (n_users, n_tags),
+            'user_tag_counts': (n_users, n_tags)
+        }
+        for name, shape in shapes.items():
+            setattr(self, name, sparse.csr_matrix(
+                (state[f"{name}_data"], state[f"{name}_indices"], state[f"{name}_indptr"]),
+                shape=shape
+            ))
+        self.total_transitions = int(state['total_transitions'])
+        self.user_last_tag = state['user_last_tag']
+        self._set_concept_relationships()
+        
+        self.pair_moments = {name: state[f"moment_{name}"] for name in MOMENT_NAMES}
+        self.prerequisite_correlations, self.prerequisite_co_users = (
+            self._correlations_from_moments(self.pair_moments)
+        )
+        self._set_prerequisite_strengths()
     
     def _generate_topic_structure(self) -> Dict:
         """Generate topic structure based on analysis."""
-        structure = {"concepts": {}, "relationships": {}}
+        return _build_structure(_object_labels(self.tag_labels), self._topic_structure_arrays())
+    
+    def _topic_structure_arrays(self) -> Dict[str, np.ndarray]:
+        """Topic structure in columnar form, as consumed by ``_build_structure``.
         
-        # Generate concept information
-        for tag in self.knowledge_tags:
-            # Calculate difficulty from success rate
-            difficulty = 1 - self.success_rates[tag]['correct_rate']
-            
-            # Find prerequisites (strongest prerequisite relationships)
-            prerequisites = [
-                prev_tag for prev_tag, strength in 
-                sorted(self.prerequisite_strengths[tag].items(),
-                      key=lambda x: x[1], reverse=True)
-                if strength > 0.1  # Minimum correlation threshold
-            ]
-            
-            structure["concepts"][tag] = {
-                "difficulty": float(difficulty),
-                "prerequisites": prerequisites,
-                "avg_time": float(self.success_rates[tag]['avg_time']),
-                "total_attempts": int(self.success_rates[tag]['attempts'])
-            }
+        Works on dense tag x tag arrays rather than the nested dicts, so
+        the cost beyond a few array passes is linear in the size of the
+        generated structure. The arrays are also what the analysis cache
+        stores, so a cache hit skips this step.
+        """
+        prerequisites = self.prerequisite_matrix
+        transitions = self.transition_counts.toarray() / max(self.total_transitions, 1)
+        totals = self.tag_totals.reindex(self.tag_labels)
+        
+        # Find prerequisites (strongest prerequisite relationships)
+        tags, prereqs = np.nonzero(prerequisites > 0.1)  # Minimum correlation threshold
+        order = np.lexsort((-prerequisites[tags, prereqs], tags))
+        
+        # Combine transition probability with prerequisite strength:
+        # strengths[i, j] pairs transitions i -> j with tag i as a prerequisite of j
+        strengths = (transitions + prerequisites.T) / 2
+        np.fill_diagonal(strengths, 0.0)
+        bidirectional = (transitions.T > 0.01) & (prerequisites > 0.1)
+        firsts, seconds = np.nonzero(strengths > 0.01)  # Minimum relationship strength
         
-        # Generate relationship information
-        for tag1 in self.knowledge_tags:
-            for tag2 in self.knowledge_tags:
-                if tag1 != tag2:
-                    # Combine transition probability with prerequisite strength
-                    strength = (
-                        self.concept_relationships[tag1][tag2] +
-                        self.prerequisite_strengths[tag2][tag1]
-                    ) / 2
-                    
-                    if strength > 0.01:  # Minimum relationship strength
-                        structure["relationships"][f"{tag1}_to_{tag2}"] = {
-                            "connects": [tag1, tag2],
-                            "strength": float(strength),
-                            "bidirectional": bool(
-                                self.concept_relationships[tag2][tag1] > 0.01 and
-                                self.prerequisite_strengths[tag1][tag2] > 0.1
-                            )
-                        }
-        
-        return structure
+        return {
+            # Calculate difficulty from success rate
+            'difficulty': 1 - (totals['correct_sum'] / totals['correct_count']).to_numpy(),
+            'avg_time': (totals['time_sum'] / totals['time_count']).to_numpy(),
+            'attempts': totals['attempts'].to_numpy(dtype=np.int64),
+            'prerequisites': prereqs[order],
+            'prerequisite_bounds': np.searchsorted(tags[order], np.arange(len(self.tag_labels) + 1)),
+            'relationship_firsts': firsts,
+            'relationship_seconds': seconds,
+            'relationship_strengths': strengths[firsts, seconds],
+            'relationship_bidirectional': bidirectional[firsts, seconds]
+        }
     
     def save_structure(self, output_path: Path) -> None:
         """Save extracted knowledge structure."""
-        structure = self._generate_topic_structure()
+        structure = self.structure
+        if structure is None:
+            structure = self._generate_topic_structure()
         
         # Calculate summary statistics
         summary = {
@@ -176,4 +509,82 @@ class EdNetAnalyzer:
         with open(output_path.parent / 'analysis_summary.json', 'w') as f:
             json.dump(summary, f, indent=2)
             
-        logger.info(f"Saved knowledge structure to {output_path}")
\ No newline at end of file
+        logger.info(f"Saved knowledge structure to {output_path}")
+
+
+def _extend_labels(labels: pd.Index, values: pd.Series) -> Tuple[pd.Index, np.ndarray]:
+    """Integer codes for values, appending unseen labels in order of appearance."""
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques)
+    known = labels.get_indexer(uniques)
+    unseen = known < 0
+    known[unseen] = len(labels) + np.arange(unseen.sum())
+    labels = labels.append(pd.Index(uniques[unseen]))
+    return labels, known[codes]
+
+def _resize_sparse(matrix: sparse.spmatrix, shape: Tuple[int, int]) -> sparse.csr_matrix:
+    """Copy of a sparse matrix zero-padded to a larger shape."""
+    coo = matrix.tocoo()
+    return sparse.csr_matrix((coo.data, (coo.row, coo.col)), shape=shape)
+
+def _object_labels(labels: pd.Index) -> np.ndarray:
+    """Labels as an object array, for fancy indexing into Python keys."""
+    return np.asarray(labels, dtype=object)
+
+def _fill_nested(target: Dict, labels: np.ndarray, rows: np.ndarray,
+                 cols: np.ndarray, values: np.ndarray) -> None:
+    """Set ``target[labels[row]][labels[col]] = value`` for row-sorted index arrays."""
+    col_labels = labels[cols].tolist()
+    values = values.tolist()
+    starts = np.flatnonzero(np.diff(rows, prepend=-1))
+    ends = np.append(starts[1:], len(rows))
+    for row, start, end in zip(rows[starts].tolist(), starts.tolist(), ends.tolist()):
+        target[labels[row]].update(zip(col_labels[start:end], values[start:end]))
+
+def _build_structure(labels: np.ndarray, arrays: Dict[str, np.ndarray]) -> Dict:
+    """Topic structure dictionaries from ``_topic_structure_arrays`` output."""
+    structure = {"concepts": {}, "relationships": {}}
+    prereq_labels = labels[arrays['prerequisites']].tolist()
+    bounds = arrays['prerequisite_bounds'].tolist()
+    
+    # Generate concept information
+    for i, (tag, difficulty, avg_time, attempts) in enumerate(zip(
+            labels.tolist(), arrays['difficulty'].tolist(),
+            arrays['avg_time'].tolist(), arrays['attempts'].tolist())):
+        structure["concepts"][tag] = {
+            "difficulty": difficulty,
+            "prerequisites": prereq_labels[bounds[i]:bounds[i + 1]],
+            "avg_time": avg_time,
+            "total_attempts": attempts
+        }
+    
+    # Generate relationship information
+    for tag1, tag2, strength, both_ways in zip(labels[arrays['relationship_firsts']].tolist(),
+                                               labels[arrays['relationship_seconds']].tolist(),
+                                               arrays['relationship_strengths'].tolist(),
+                                               arrays['relationship_bidirectional'].tolist()):
+        structure["relationships"][f"{tag1}_to_{tag2}"] = {
+            "connects": [tag1, tag2],
+            "strength": strength,
+            "bidirectional": both_ways
+        }
+    
+    return structure
+
+@contextmanager
+def _gc_paused():
+    """Disable the cyclic garbage collector for the duration of the block."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _label_array(labels: pd.Index) -> np.ndarray:
+    """Labels as a non-object array that np.savez can store without pickling."""
+    array = np.asarray(labels)
+    if array.dtype == object:
+        array = array.astype(str)
+    return array
@@ -3,12 +3,20 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
 import yaml
 import logging
+import tempfile
+from prototype.data.dataset_loader import load_interactions, iter_interaction_chunks
 
 logger = logging.getLogger(__name__)
 
+# Attempts averaged at the end of a history for the learning-rate metric
+LEARNING_RATE_WINDOW = 5
+
+# Partition files for distinct (user, question) pairs in streaming mode
+QUESTION_PAIR_PARTITIONS = 64
+
 class EdNetSampler:
     """Handles systematic sampling from EdNet dataset."""
     
@@ -17,12 +25,21 @@ class EdNetSampler:
             self.config = yaml.safe_load(f)
         self.ednet_config = self.config['experiment']['ednet']
         
-    def sample_groups(self, ednet_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Create matched experimental and control groups."""
+    def sample_groups(self,
+                      ednet_path: str,
+                      chunksize: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Create matched experimental and control groups.
+        
+        With ``chunksize`` the file is streamed in two passes and never held
+        in memory as a whole (see ``_sample_groups_streaming``).
+        """
+        if chunksize is not None:
+            return self._sample_groups_streaming(ednet_path, chunksize)
+        
         logger.info(f"Loading EdNet data from {ednet_path}")
         
         # Load data
-        df = pd.read_csv(ednet_path)
+        df = load_interactions(ednet_path)
         
         # Filter for minimum interactions per student
         interaction_counts = df.groupby('user_id').size()
@@ -41,6 +58,132 @@ class EdNetSampler:
         logger.info(f"Created groups with {len(control)} students each")
         return self._get_student_data(df_filtered, control), self._get_student_data(df_filtered, experimental)
     
+    def _sample_groups_streaming(self,
+                                 ednet_path: str,
+                                 chunksize: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Create matched groups from a file read in chunks.
+        
+        Pass one folds each chunk into per-student aggregates; pass two keeps
+        only the rows of the sampled students. Distinct (user, question)
+        pairs for ``unique_questions`` are spilled to temporary files
+        partitioned by user, so peak memory is the per-student summary plus
+        one chunk and one partition of pairs, not the whole file.
+        """
+        logger.info(f"Streaming EdNet data from {ednet_path} in chunks of {chunksize} rows")
+        
+        student_metrics = self._stream_student_metrics(ednet_path, chunksize)
+        student_metrics = student_metrics[
+            student_metrics['correct']['count'] >= self.ednet_config['min_interactions_per_student']
+        ].reset_index(drop=True)
+        
+        control, experimental = self._create_matched_groups(student_metrics)
+        logger.info(f"Created groups with {len(control)} students each")
+        
+        control_parts, experimental_parts = [], []
+        for chunk in iter_interaction_chunks(ednet_path, chunksize):
+            control_parts.append(self._get_student_data(chunk, control))
+            experimental_parts.append(self._get_student_data(chunk, experimental))
+        
+        return self._concat_chunks(control_parts), self._concat_chunks(experimental_parts)
+    
+    @staticmethod
+    def _concat_chunks(parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate chunk slices, restoring categoricals whose categories differ per chunk."""
+        data = pd.concat(parts)
+        for column in parts[0].select_dtypes('category').columns:
+            data[column] = data[column].astype('category')
+        return data
+    
+    def _stream_student_metrics(self, ednet_path: str, chunksize: int) -> pd.DataFrame:
+        """Student metrics equivalent to ``_calculate_student_metrics``, built chunk by chunk."""
+        totals = None
+        first_correct = pd.Series(dtype=np.float64)
+        recent = pd.DataFrame({'user_id': pd.Series(dtype=np.int64),
+                               'correct': pd.Series(dtype=np.float64)})
+        
+        # Distinct (user, question) pairs are spilled to disk, partitioned by
+        # user, and counted one partition at a time
+        spill_dir = tempfile.TemporaryDirectory(prefix='ednet_pairs_')
+        spill_paths = [Path(spill_dir.name) / f"pairs_{k}.bin" for k in range(QUESTION_PAIR_PARTITIONS)]
+        
+        for chunk in iter_interaction_chunks(ednet_path, chunksize):
+            elapsed = chunk['elapsed_time'].astype(np.float64)
+            partial = pd.DataFrame({
+                'count': chunk['correct'].notna().astype(np.int64),
+                'correct_sum': chunk['correct'].astype(np.float64),
+                'time_count': elapsed.notna().astype(np.int64),
+                'time_sum': elapsed,
+                'time_sq_sum': elapsed ** 2
+            }).groupby(chunk['user_id'].to_numpy()).sum()
+            totals = partial if totals is None else totals.add(partial, fill_value=0)
+            
+            # First attempt of students not seen in earlier chunks
+            firsts = chunk.drop_duplicates('user_id').set_index('user_id')['correct']
+            first_correct = pd.concat([
+                first_correct,
+                firsts[~firsts.index.isin(first_correct.index)].astype(np.float64)
+            ])
+            
+            # Only the latest attempts per student are needed for the learning rate
+            latest = chunk[['user_id', 'correct']].astype({'user_id': np.int64, 'correct': np.float64})
+            recent = (pd.concat([recent, latest], ignore_index=True)
+                      .groupby('user_id')
+                      .tail(LEARNING_RATE_WINDOW))
+            
+            self._spill_question_pairs(chunk, spill_paths)
+        
+        with spill_dir:
+            unique_questions = self._count_unique_questions(spill_paths)
+        
+        totals = totals.sort_index()
+        users = totals.index
+        counts = totals['count'].astype(np.int64)
+        time_mean = totals['time_sum'] / totals['time_count']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_var = ((totals['time_sq_sum'] - totals['time_sum'] * time_mean)
+                        / (totals['time_count'] - 1))
+        
+        learning_rates = (recent.groupby('user_id')['correct'].mean().astype(np.float64)
+                          - first_correct).reindex(users)
+        learning_rates[counts.to_numpy() < 2] = 0
+        
+        return pd.DataFrame({
+            ('user_id', ''): users.to_numpy(),
+            ('correct', 'mean'): (totals['correct_sum'] / counts).to_numpy(),
+            ('correct', 'count'): counts.to_numpy(),
+            ('elapsed_time', 'mean'): time_mean.to_numpy(),
+            ('elapsed_time', 'std'): np.sqrt(time_var.clip(lower=0)).to_numpy(),
+            ('question_id', 'nunique'): unique_questions.reindex(users, fill_value=0).to_numpy(),
+            ('learning_rate', ''): learning_rates.to_numpy()
+        })
+    
+    @staticmethod
+    def _spill_question_pairs(chunk: pd.DataFrame, spill_paths: List[Path]) -> None:
+        """Append a chunk's distinct (user, question) pairs to per-user-partition files."""
+        pairs = np.unique(
+            np.column_stack([chunk['user_id'].to_numpy(np.int32),
+                             chunk['question_id'].to_numpy(np.int32)]).view(np.int64).ravel()
+        )
+        users = pairs.view(np.int32).reshape(-1, 2)[:, 0]
+        partitions = users % len(spill_paths)
+        for k in np.unique(partitions):
+            with open(spill_paths[k], 'ab') as f:
+                pairs[partitions == k].tofile(f)
+    
+    @staticmethod
+    def _count_unique_questions(spill_paths: List[Path]) -> pd.Series:
+        """Distinct questions per user from the partitioned pair files."""
+        counts = []
+        for path in spill_paths:
+            if not path.exists():
+                continue
+            # Each pair is packed into one int64, so distinct pairs are distinct values
+            pairs = np.unique(np.fromfile(path, dtype=np.int64))
+            users, n_questions = np.unique(pairs.view(np.int32).reshape(-1, 2)[:, 0],
+                                           return_counts=True)
+            counts.append(pd.Series(n_questions, index=users))
+        return pd.concat(counts) if counts else pd.Series(dtype=np.int64)
+    
     def _calculate_student_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate comprehensive student metrics."""
         metrics = df.groupby('user_id').agg({
@@ -50,19 +193,32 @@ class EdNetSampler:
         }).reset_index()
         
         # Add learning rate metric (improvement over time)
-        learning_rates = []
-        for student in metrics['user_id']:
-            student_data = df[df['user_id'] == student]
-            if len(student_data) >= 2:
-                # Calculate rolling average of performance
-                rolling_perf = student_data['correct'].rolling(5, min_periods=1).mean()
-                learning_rates.append((rolling_perf.iloc[-1] - rolling_perf.iloc[0]))
-            else:
-                learning_rates.append(0)
-        
-        metrics['learning_rate'] = learning_rates
+        metrics['learning_rate'] = self._calculate_learning_rates(df)
         return metrics
     
+    @staticmethod
+    def _calculate_learning_rates(df: pd.DataFrame,
+                                  window: int = LEARNING_RATE_WINDOW) -> np.ndarray:
+        """Per-student change in rolling performance, ordered by user_id.
+        
+        The rolling mean over the last ``window`` attempts minus the first
+        attempt, computed for all students at once from prefix sums over
+        rows sorted by user (keeping each student's row order).
+        """
+        order = np.argsort(df['user_id'].to_numpy(), kind='stable')
+        correct = df['correct'].to_numpy(dtype=np.float64)[order]
+        _, counts = np.unique(df['user_id'].to_numpy(), return_counts=True)
+        
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        window_sizes = np.minimum(window, counts)
+        prefix = np.concatenate([[0.0], np.cumsum(correct)])
+        
+        last_window_mean = (prefix[ends] - prefix[ends - window_sizes]) / window_sizes
+        learning_rates = last_window_mean - correct[starts]
+        learning_rates[counts < 2] = 0
+        return learning_rates
+    
     def _create_matched_groups(self, metrics: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Create matched groups using stratified sampling."""
         group_size = self.ednet_config['control_group_size']
@@ -71,7 +227,7 @@ class EdNetSampler:
         metrics['composite_score'] = (
             metrics['correct']['mean'] * 0.4 +
             metrics['learning_rate'] * 0.3 +
-            (metrics['question_id'] / metrics['question_id'].max()) * 0.3
+            (metrics['question_id']['nunique'] / metrics['question_id']['nunique'].max()) * 0.3
         )
         
         # Create stratification bins
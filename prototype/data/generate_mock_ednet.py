@@ -2,11 +2,15 @@
 
 import pandas as pd
 import numpy as np
-from typing import List
+from typing import List, Optional
 import logging
+from prototype.data.dataset_loader import ParquetChunkWriter
 
 logger = logging.getLogger(__name__)
 
+# Students simulated together from one child generator
+STUDENT_BLOCK = 10_000
+
 # Define knowledge concepts and their prerequisites
 KNOWLEDGE_STRUCTURE = {
     'algebra_basics': {
@@ -29,78 +33,152 @@ KNOWLEDGE_STRUCTURE = {
 
 def generate_mock_ednet(n_students: int = 1000, 
                        n_questions_per_student: int = 50,
-                       output_file: str = "mock_ednet_kt1.csv") -> None:
-    """Generate mock EdNet-KT1 data."""
+                       output_file: str = "mock_ednet_kt1.csv",
+                       rng: Optional[np.random.Generator] = None,
+                       chunk_students: Optional[int] = None) -> None:
+    """Generate mock EdNet-KT1 data.
+    
+    Students are simulated in blocks of ``STUDENT_BLOCK``, all students of a
+    block in lockstep, one question step at a time, so the cost is a few
+    array operations per step rather than per interaction. Each block draws
+    from its own child of a seed sequence taken from ``rng``, so the data
+    depends only on ``rng``'s seed, not on the chunking. Chunks of
+    ``chunk_students`` (rounded up to whole blocks) are appended to
+    ``output_file`` (CSV, or Parquet when the name ends in .parquet and
+    pyarrow is installed).
+    """
     
     logger.info(f"Generating mock data for {n_students} students")
     
-    data = []
+    rng = rng if rng is not None else np.random.default_rng()
+    n_blocks = -(-n_students // STUDENT_BLOCK)
+    block_seeds = np.random.SeedSequence(int(rng.integers(2**63))).spawn(n_blocks)
+    chunk_blocks = max(1, -(-(chunk_students or n_students) // STUDENT_BLOCK))
     knowledge_tags = list(KNOWLEDGE_STRUCTURE.keys())
+    writer = ParquetChunkWriter(output_file) if str(output_file).endswith('.parquet') else None
+    
+    tag_stats = np.zeros((len(knowledge_tags), 3))  # correct, attempts, time
     
-    for user_id in range(n_students):
-        # Track student's knowledge level for each concept
-        knowledge_levels = {tag: 0.0 for tag in knowledge_tags}
+    for first_block in range(0, n_blocks, chunk_blocks):
+        blocks = range(first_block, min(first_block + chunk_blocks, n_blocks))
+        df = pd.concat([
+            _simulate_students(np.random.default_rng(block_seeds[block]),
+                               block * STUDENT_BLOCK,
+                               min(STUDENT_BLOCK, n_students - block * STUDENT_BLOCK),
+                               n_questions_per_student)
+            for block in blocks
+        ], ignore_index=True)
         
-        for q_idx in range(n_questions_per_student):
-            # Select knowledge tag based on prerequisites
-            available_tags = [
-                tag for tag in knowledge_tags
-                if all(knowledge_levels[prereq] > 0.5 
-                      for prereq in KNOWLEDGE_STRUCTURE[tag]['prerequisites'])
-            ]
-            
-            if not available_tags:
-                available_tags = ['algebra_basics']
-                
-            tag = np.random.choice(available_tags)
-            
-            # Generate question attempt
-            difficulty = KNOWLEDGE_STRUCTURE[tag]['difficulty']
-            knowledge_level = knowledge_levels[tag]
-            
-            # Probability of correct answer based on knowledge and difficulty
-            p_correct = (knowledge_level + 0.1) / (difficulty + 0.2)
-            correct = np.random.random() < p_correct
-            
-            # Generate elapsed time (more time for difficult questions)
-            base_time = 30 + (difficulty * 60)  # 30s to 90s base time
-            elapsed_time = int(base_time * (1 + np.random.exponential(0.5)))
-            
-            # Record interaction
-            data.append({
-                'user_id': user_id,
-                'question_id': len(data),  # unique question ID
-                'correct': int(correct),
-                'elapsed_time': elapsed_time,
-                'knowledge_tag': tag
-            })
-            
-            # Update knowledge level
-            if correct:
-                knowledge_levels[tag] = min(1.0, knowledge_levels[tag] + 0.1)
-    
-    # Convert to DataFrame and save
-    df = pd.DataFrame(data)
-    df.to_csv(output_file, index=False)
-    
-    logger.info(f"Generated {len(df)} interactions")
+        codes = df['knowledge_tag'].cat.codes.to_numpy()
+        tag_stats[:, 0] += np.bincount(codes, weights=df['correct'], minlength=len(knowledge_tags))
+        tag_stats[:, 1] += np.bincount(codes, minlength=len(knowledge_tags))
+        tag_stats[:, 2] += np.bincount(codes, weights=df['elapsed_time'], minlength=len(knowledge_tags))
+        
+        if writer is not None:
+            writer.write(df)
+        else:
+            df.to_csv(output_file, index=False,
+                      mode='w' if first_block == 0 else 'a',
+                      header=first_block == 0)
+    
+    if writer is not None:
+        writer.close()
+    
+    n_interactions = int(tag_stats[:, 1].sum())
+    logger.info(f"Generated {n_interactions} interactions")
     logger.info(f"Saved to {output_file}")
     
     # Print summary statistics
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correct_rates = tag_stats[:, 0] / tag_stats[:, 1]
+        avg_times = tag_stats[:, 2] / tag_stats[:, 1]
     print("\nMock EdNet-KT1 Dataset Summary")
     print("=" * 40)
     print(f"Total Students: {n_students}")
-    print(f"Total Interactions: {len(df)}")
+    print(f"Total Interactions: {n_interactions}")
     print(f"Knowledge Tags: {', '.join(knowledge_tags)}")
     print("\nCorrect Answer Rates by Concept:")
-    for tag in knowledge_tags:
-        tag_data = df[df['knowledge_tag'] == tag]
-        print(f"{tag}: {tag_data['correct'].mean():.2f}")
+    for tag, rate in zip(knowledge_tags, correct_rates):
+        print(f"{tag}: {rate:.2f}")
     print("\nAverage Time by Concept (seconds):")
-    for tag in knowledge_tags:
-        tag_data = df[df['knowledge_tag'] == tag]
-        print(f"{tag}: {tag_data['elapsed_time'].mean():.0f}")
+    for tag, avg_time in zip(knowledge_tags, avg_times):
+        print(f"{tag}: {avg_time:.0f}")
+
+def _simulate_students(rng: np.random.Generator,
+                       first_student: int,
+                       n_students: int,
+                       n_questions: int) -> pd.DataFrame:
+    """Simulate a block of students' interactions with NumPy arrays."""
+    knowledge_tags = list(KNOWLEDGE_STRUCTURE.keys())
+    n_tags = len(knowledge_tags)
+    difficulty = np.array([KNOWLEDGE_STRUCTURE[tag]['difficulty'] for tag in knowledge_tags])
+    
+    # prerequisites[t, p] is 1 when tag p is a prerequisite of tag t
+    prerequisites = np.zeros((n_tags, n_tags), dtype=np.int64)
+    for t, tag in enumerate(knowledge_tags):
+        for prereq in KNOWLEDGE_STRUCTURE[tag]['prerequisites']:
+            prerequisites[t, knowledge_tags.index(prereq)] = 1
+    
+    knowledge_levels = np.zeros((n_students, n_tags))
+    students = np.arange(n_students)
+    tags = np.empty((n_students, n_questions), dtype=np.int64)
+    correct = np.empty((n_students, n_questions), dtype=np.int8)
+    
+    for q_idx in range(n_questions):
+        # Select knowledge tag based on prerequisites
+        unmet = (knowledge_levels <= 0.5).astype(np.int64) @ prerequisites.T
+        available = unmet == 0
+        available[~available.any(axis=1), 0] = True  # fall back to algebra_basics
+        
+        # Uniform choice among each student's available tags
+        n_available = available.sum(axis=1)
+        pick = (rng.random(n_students) * n_available).astype(np.int64)
+        tag = np.argmax(np.cumsum(available, axis=1) > pick[:, None], axis=1)
+        
+        # Probability of correct answer based on knowledge and difficulty
+        p_correct = (knowledge_levels[students, tag] + 0.1) / (difficulty[tag] + 0.2)
+        is_correct = rng.random(n_students) < p_correct
+        
+        # Update knowledge level
+        knowledge_levels[students[is_correct], tag[is_correct]] = np.minimum(
+            1.0, knowledge_levels[students[is_correct], tag[is_correct]] + 0.1
+        )
+        
+        tags[:, q_idx] = tag
+        correct[:, q_idx] = is_correct
+    
+    # Generate elapsed time (more time for difficult questions)
+    base_time = 30 + (difficulty[tags] * 60)  # 30s to 90s base time
+    elapsed_time = (base_time * (1 + rng.exponential(0.5, size=tags.shape))).astype(np.int64)
+    
+    first_question = first_student * n_questions
+    return pd.DataFrame({
+        'user_id': np.repeat(np.arange(first_student, first_student + n_students, dtype=np.int32),
+                             n_questions),
+        'question_id': np.arange(first_question, first_question + n_students * n_questions,
+                                 dtype=np.int32),  # unique question ID
+        'correct': correct.ravel(),
+        'elapsed_time': elapsed_time.ravel().astype(np.int32),
+        'knowledge_tag': pd.Categorical.from_codes(tags.ravel(), categories=knowledge_tags)
+    })
 
 if __name__ == "__main__":
+    import argparse
+    
     logging.basicConfig(level=logging.INFO)
-    generate_mock_ednet()
\ No newline at end of file
+    
+    parser = argparse.ArgumentParser(description='Generate mock EdNet-KT1 data')
+    parser.add_argument('--n_students', type=int, default=1000)
+    parser.add_argument('--n_questions', type=int, default=50,
+                       help='Questions per student')
+    parser.add_argument('--output_file', type=str, default='mock_ednet_kt1.csv',
+                       help='Output CSV or .parquet file')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--chunk_students', type=int, default=None,
+                       help='Students simulated and written per chunk '
+                            f'(rounded up to multiples of {STUDENT_BLOCK})')
+    
+    args = parser.parse_args()
+    generate_mock_ednet(args.n_students, args.n_questions, args.output_file,
+                        rng=np.random.default_rng(args.seed),
+                        chunk_students=args.chunk_students)
@@ -0,0 +1,126 @@
+# File: prototype/data/interaction_store.py
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+META_FILE = 'meta.json'
+
+# On-disk dtypes; knowledge_tag is stored as integer codes into tags.npy
+STORE_SCHEMA: Dict[str, str] = {
+    'user_id': 'int32',
+    'question_id': 'int32',
+    'correct': 'int8',
+    'elapsed_time': 'int32',
+    'knowledge_tag': 'int32'
+}
+
+def is_interaction_store(path: Union[str, Path]) -> bool:
+    """Whether a path points to an interaction store directory."""
+    return (Path(path) / META_FILE).exists()
+
+def build_interaction_store(data: pd.DataFrame, store_dir: Union[str, Path]) -> Path:
+    """Write interactions as one .npy file per column, sorted by user.
+
+    Rows keep their original order within each user. ``user_offsets.npy``
+    holds the CSR-style index: the rows of the i-th user in ``user_ids.npy``
+    are ``offsets[i]:offsets[i + 1]``.
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    order = np.argsort(data['user_id'].to_numpy(), kind='stable')
+    columns = []
+    for column, dtype in STORE_SCHEMA.items():
+        if column not in data.columns:
+            continue
+        values = data[column].to_numpy()[order]
+        if column == 'knowledge_tag':
+            codes, tags = pd.factorize(values)
+            np.save(store_dir / 'tags.npy', np.asarray(tags).astype(str))
+            values = codes
+        np.save(store_dir / f"{column}.npy", values.astype(dtype))
+        columns.append(column)
+
+    user_ids, counts = np.unique(data['user_id'].to_numpy(), return_counts=True)
+    np.save(store_dir / 'user_ids.npy', user_ids.astype(STORE_SCHEMA['user_id']))
+    np.save(store_dir / 'user_offsets.npy', np.concatenate([[0], np.cumsum(counts)]).astype(np.int64))
+
+    with open(store_dir / META_FILE, 'w') as f:
+        json.dump({'n_rows': len(data), 'columns': columns}, f, indent=2)
+
+    logger.info(f"Wrote interaction store with {len(data)} rows to {store_dir}")
+    return store_dir
+
+class InteractionStore:
+    """Read-only, memory-mapped view of an interaction store.
+
+    Columns are opened with ``mmap_mode='r'``, so processes opening the
+    same store share its pages through the OS page cache.
+    """
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / META_FILE) as f:
+            self.meta = json.load(f)
+        self.columns = {
+            column: np.load(self.store_dir / f"{column}.npy", mmap_mode='r')
+            for column in self.meta['columns']
+        }
+        self.user_ids = np.load(self.store_dir / 'user_ids.npy', mmap_mode='r')
+        self.user_offsets = np.load(self.store_dir / 'user_offsets.npy', mmap_mode='r')
+        self.tags = None
+        if 'knowledge_tag' in self.columns:
+            self.tags = np.load(self.store_dir / 'tags.npy')
+
+    def __len__(self) -> int:
+        return self.meta['n_rows']
+
+    @property
+    def n_users(self) -> int:
+        return len(self.user_ids)
+
+    def user_slice(self, user_index: int) -> slice:
+        """Row range of the user at a position in ``user_ids``."""
+        return slice(int(self.user_offsets[user_index]), int(self.user_offsets[user_index + 1]))
+
+    def rows_for_user(self, user_id: int) -> slice:
+        """Row range of a user id (empty if the user is unknown)."""
+        index = int(np.searchsorted(self.user_ids, user_id))
+        if index == len(self.user_ids) or self.user_ids[index] != user_id:
+            return slice(0, 0)
+        return self.user_slice(index)
+
+    def user_frame(self, user_id: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """All rows of one user as a DataFrame."""
+        return self.to_frame(columns, rows=self.rows_for_user(user_id))
+
+    def to_frame(self,
+                 columns: Optional[List[str]] = None,
+                 rows: slice = slice(None)) -> pd.DataFrame:
+        """Columns as a DataFrame backed by the memory maps where possible."""
+        frame = {}
+        for column in columns or self.meta['columns']:
+            values = self.columns[column][rows]
+            if column == 'knowledge_tag':
+                values = pd.Categorical.from_codes(values, categories=self.tags)
+            frame[column] = values
+        return pd.DataFrame(frame, copy=False)
+
+if __name__ == "__main__":
+    import argparse
+    from prototype.data.dataset_loader import load_interactions
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description='Build a memory-mapped interaction store')
+    parser.add_argument('csv_path', type=str, help='Path to EdNet-style interaction CSV')
+    parser.add_argument('store_dir', type=str, help='Output directory for the store')
+
+    args = parser.parse_args()
+    build_interaction_store(load_interactions(args.csv_path), args.store_dir)
@@ -3,19 +3,28 @@
 import logging
 from pathlib import Path
 import json
+from typing import Optional
 from prototype.data.ednet_analyzer import EdNetAnalyzer
 from prototype.visualization.knowledge_visualizer import KnowledgeVisualizer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_analysis(ednet_path: str, output_dir: str = "topics") -> None:
-    """Run EdNet analysis and visualize results."""
+def run_analysis(ednet_path: str,
+                 output_dir: str = "topics",
+                 cache_dir: Optional[str] = None) -> None:
+    """Run EdNet analysis and visualize results.
+    
+    Intermediate results are cached under ``cache_dir`` (default
+    ``<output_dir>/.analysis_cache``); pass an empty string to disable.
+    """
     logger.info(f"Analyzing EdNet data from: {ednet_path}")
     
     # Run analysis
     output_path = Path(output_dir)
-    analyzer = EdNetAnalyzer(ednet_path)
+    if cache_dir is None:
+        cache_dir = str(output_path / ".analysis_cache")
+    analyzer = EdNetAnalyzer(ednet_path, cache_dir=cache_dir or None)
     structure = analyzer.analyze_structure()
     
     # Save structure
@@ -67,6 +76,8 @@ if __name__ == "__main__":
     parser.add_argument('ednet_path', type=str, help='Path to EdNet-KT1 dataset')
     parser.add_argument('--output_dir', type=str, default='topics',
                        help='Output directory for analysis files')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                       help='Analysis cache directory (default: <output_dir>/.analysis_cache, "" disables)')
     
     args = parser.parse_args()
-    run_analysis(args.ednet_path, args.output_dir)
\ No newline at end of file
+    run_analysis(args.ednet_path, args.output_dir, args.cache_dir)
\ No newline at end of file
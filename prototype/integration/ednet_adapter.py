@@ -5,6 +5,7 @@ import numpy as np
 from pathlib import Path
 import logging
 from typing import List, Dict, Tuple
+from prototype.data.dataset_loader import load_interactions
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,10 @@ class EdNetAdapter:
         logger.info(f"Loading EdNet data from {filepath}")
         
         # Load data
-        data = pd.read_csv(filepath)
+        data = load_interactions(
+            filepath,
+            columns=['user_id', 'question_id', 'correct', 'elapsed_time']
+        )
         logger.info(f"Loaded {len(data)} interactions")
         
         # Extract interaction patterns
@@ -1,133 +1,429 @@
 # File: prototype/models/blackboard_core.py
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Sequence, Tuple, Union
 from datetime import datetime
 import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_DIM = 768
+
+# BlackboardSystem.build_indexes clusters levels with at least this many
+# embeddings into an IVF index
+IVF_MIN_SIZE = 10_000
+
+# Prompts per (knowledge source, level), compiled once at import
+PROMPT_TABLE: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ('socratic', 'observation'): (
+        "What specific examples come to mind?",
+        "Could you describe that in more detail?",
+        "How did you arrive at that observation?"
+    ),
+    ('constructivist', 'observation'): (
+        "How does this connect to your prior knowledge?",
+        "What similar experiences have you had?",
+        "How would you explain this to a peer?"
+    ),
+    ('experiential', 'observation'): (
+        "What practical situations reflect this?",
+        "How have you applied this in practice?",
+        "What concrete examples illustrate this?"
+    ),
+    ('socratic', 'pattern'): (
+        "What patterns do you notice emerging?",
+        "How do these observations relate to each other?",
+        "What common threads do you see?"
+    ),
+    ('constructivist', 'pattern'): (
+        "How might these patterns connect to broader concepts?",
+        "What underlying structure are you noticing?",
+        "How do these patterns build on each other?"
+    ),
+    ('experiential', 'pattern'): (
+        "How do these patterns manifest in practice?",
+        "What real-world situations follow this pattern?",
+        "How could we apply these patterns?"
+    ),
+    ('socratic', 'concept'): (
+        "How might this concept apply more broadly?",
+        "What assumptions underlie this concept?",
+        "How would you test this concept?"
+    ),
+    ('constructivist', 'concept'): (
+        "How does this concept build on what we know?",
+        "What new understanding does this concept enable?",
+        "How might we extend this concept?"
+    ),
+    ('experiential', 'concept'): (
+        "How would this concept work in practice?",
+        "What real situations exemplify this concept?",
+        "How could we apply this concept?"
+    ),
+    ('socratic', 'principle'): (
+        "What broader implications does this principle have?",
+        "How might this principle generalize?",
+        "What evidence supports this principle?"
+    ),
+    ('constructivist', 'principle'): (
+        "How does this principle transform our understanding?",
+        "What new possibilities does this principle suggest?",
+        "How might this principle evolve further?"
+    ),
+    ('experiential', 'principle'): (
+        "How could this principle guide practice?",
+        "What practical applications emerge from this principle?",
+        "How might we implement this principle?"
+    )
+}
+
+class EmbeddingArena:
+    """Growable matrix holding embedding vectors (of a blackboard or a level).
+    
+    Vectors are stored as rows of a single float32 (or float16) matrix that
+    doubles in capacity when full, together with their norms, so owners only
+    keep a row index and similarity queries are one matrix-vector product.
+    """
+    
+    def __init__(self, dim: int = EMBEDDING_DIM, dtype=np.float32, capacity: int = 64):
+        self.dim = dim
+        self._size = 0
+        self._vectors = np.empty((max(1, capacity), dim), dtype=dtype)
+        self._norms = np.empty(max(1, capacity), dtype=np.float32)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Read-only view of a row; it does not follow later growth of the arena."""
+        if not 0 <= index < self._size:
+            raise IndexError("embedding index out of range")
+        row = self._vectors[index]
+        row.flags.writeable = False
+        return row
+    
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self._size]
+    
+    @property
+    def dtype(self) -> np.dtype:
+        return self._vectors.dtype
+    
+    def add(self, vector: np.ndarray) -> int:
+        """Copy a vector into the arena and return its row index."""
+        vector = np.asarray(vector)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Expected embedding of shape ({self.dim},), got {vector.shape}")
+        
+        if self._size == len(self._vectors):
+            self._grow(2 * self._size)
+        
+        index = self._size
+        self._vectors[index] = vector
+        self._norms[index] = np.linalg.norm(self._vectors[index].astype(np.float32))
+        self._size += 1
+        return index
+    
+    def similarity(self,
+                   query: np.ndarray,
+                   rows: Optional[Union[Sequence[int], slice]] = None) -> np.ndarray:
+        """Cosine similarity of a query with all rows (or the given rows).
+        
+        A slice of rows is scanned in place; a sequence of row indices is
+        gathered into a copy first.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if rows is None:
+            vectors, norms = self.vectors, self._norms[:self._size]
+        elif isinstance(rows, slice):
+            vectors, norms = self.vectors[rows], self._norms[:self._size][rows]
+        else:
+            rows = np.asarray(rows, dtype=np.intp)
+            vectors, norms = self._vectors[rows], self._norms[rows]
+        
+        dots = vectors.astype(np.float32, copy=False) @ query
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return dots / (norms * np.linalg.norm(query))
+    
+    def permute(self, order: np.ndarray) -> None:
+        """Reorder the rows so that row ``i`` holds the old row ``order[i]``.
+        
+        The rows move into a new buffer, so views handed out earlier keep
+        showing the vectors they were taken from.
+        """
+        vectors = np.empty_like(self._vectors)
+        vectors[:self._size] = self._vectors[order]
+        norms = np.empty_like(self._norms)
+        norms[:self._size] = self._norms[order]
+        self._vectors, self._norms = vectors, norms
+    
+    def _grow(self, capacity: int) -> None:
+        vectors = np.empty((capacity, self.dim), dtype=self._vectors.dtype)
+        vectors[:self._size] = self._vectors[:self._size]
+        norms = np.empty(capacity, dtype=np.float32)
+        norms[:self._size] = self._norms[:self._size]
+        self._vectors, self._norms = vectors, norms
+
+class VectorIndex:
+    """Cosine top-k search over the embeddings of one blackboard level.
+    
+    The index owns the level's vectors: hypotheses attach their embedding to
+    ``arena`` and the index only records which item each arena row belongs
+    to. Until ``build`` is called every query is one matrix-vector product
+    over the whole arena. ``build`` clusters the rows with spherical k-means
+    into about sqrt(n) inverted lists (IVF) and reorders the arena list by
+    list, so a query then scans the ``n_probe`` contiguous blocks whose
+    centroids are closest plus the rows added since the build. Building is
+    never triggered by ``add`` or ``search``; ``build_due`` tells the owner
+    when the set has reached ``ivf_min_size`` or doubled since the last build.
+    """
+    
+    def __init__(self,
+                 dim: int = EMBEDDING_DIM,
+                 dtype=np.float32,
+                 ivf_min_size: int = IVF_MIN_SIZE,
+                 n_probe: int = 8,
+                 seed: int = 0):
+        self.arena = EmbeddingArena(dim, dtype=dtype)
+        self.ivf_min_size = ivf_min_size
+        self.n_probe = n_probe
+        self.seed = seed
+        # Item id of each arena row
+        self._ids = np.full(64, -1, dtype=np.intp)
+        # IVF state: centroids, list p covering rows _bounds[p]:_bounds[p + 1],
+        # and how many rows the lists cover
+        self._centroids = None
+        self._bounds = np.zeros(1, dtype=np.intp)
+        self._indexed = 0
+    
+    def __len__(self) -> int:
+        return len(self.arena)
+    
+    @property
+    def build_due(self) -> bool:
+        """Whether the set is large enough for (re)building the IVF lists."""
+        return len(self) >= self.ivf_min_size and len(self) >= 2 * self._indexed
+    
+    def add(self, item_id: int, row: int) -> None:
+        """Register ``arena`` row ``row`` under ``item_id``."""
+        if row >= len(self._ids):
+            self._ids = np.resize(self._ids, max(row + 1, 2 * len(self._ids)))
+        self._ids[row] = item_id
+    
+    def similarities(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and cosine similarities of all rows."""
+        return self._ids[:len(self)], self.arena.similarity(query)
+    
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and cosine similarities of the (approximately) k most similar rows."""
+        if self._centroids is None:
+            blocks = [slice(0, len(self))]
+        else:
+            centroid_scores = self._centroids @ np.asarray(query, dtype=np.float32)
+            n_probe = min(self.n_probe, len(self._centroids))
+            probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+            blocks = [slice(self._bounds[p], self._bounds[p + 1]) for p in probe.tolist()]
+            blocks.append(slice(self._indexed, len(self)))
+        
+        rows = np.concatenate([np.arange(block.start, block.stop) for block in blocks])
+        scores = np.concatenate([self.arena.similarity(query, block) for block in blocks])
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        k = min(k, len(rows))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return self._ids[rows[top]], scores[top]
+    
+    def build(self, n_iter: int = 10, batch_size: int = 8192) -> np.ndarray:
+        """Cluster all current rows into inverted lists.
+        
+        The arena rows are reordered so each list is one contiguous block.
+        Returns the new row of every old row, for owners of row indices.
+        """
+        rng = np.random.default_rng(self.seed)
+        n = len(self)
+        n_lists = max(1, int(np.sqrt(n)))
+        vectors = self.arena.vectors
+        
+        # Train centroids on a sample of unit-normalized vectors
+        sample = rng.choice(n, size=min(n, 64 * n_lists), replace=False)
+        train = self._unit_vectors(vectors[sample])
+        centroids = train[rng.choice(len(train), size=n_lists, replace=False)]
+        for _ in range(n_iter):
+            assignment = np.argmax(train @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, train)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        
+        # Assign every row in batches; the row norm does not change the argmax
+        assignment = np.empty(n, dtype=np.intp)
+        for start in range(0, n, batch_size):
+            batch = vectors[start:start + batch_size].astype(np.float32, copy=False)
+            assignment[start:start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+        
+        # Lay the arena out list by list
+        order = np.argsort(assignment, kind='stable')
+        self.arena.permute(order)
+        self._ids[:n] = self._ids[order]
+        self._bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        self._centroids = centroids.astype(np.float32)
+        self._indexed = n
+        logger.info(f"Built IVF index with {n_lists} lists over {n} embeddings")
+        
+        new_rows = np.empty(n, dtype=np.intp)
+        new_rows[order] = np.arange(n)
+        return new_rows
+    
+    @staticmethod
+    def _unit_vectors(vectors: np.ndarray) -> np.ndarray:
+        vectors = vectors.astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+class ArenaEmbedding:
+    """Mixin for objects whose ``embedding`` can move into an ``EmbeddingArena``.
+    
+    Once attached the object keeps only ``arena`` and ``embedding_index``
+    and drops its own array.
+    """
+    
+    def get_embedding(self) -> Optional[np.ndarray]:
+        """Embedding vector, read from the arena once attached."""
+        if self.arena is not None:
+            return self.arena[self.embedding_index]
+        return self.embedding
+    
+    def attach_embedding(self, arena: EmbeddingArena) -> int:
+        """Move the embedding into an arena (a no-op if already there)."""
+        if self.arena is not arena:
+            self.embedding_index = arena.add(self.get_embedding())
+            self.arena = arena
+            self.embedding = None
+        return self.embedding_index
+
 @dataclass
-class KnowledgeSource:
+class KnowledgeSource(ArenaEmbedding):
     """Represents a source of knowledge in the system."""
     name: str
     expertise: List[str]
     confidence: float
-    embedding: np.ndarray
+    embedding: Optional[np.ndarray]
+    arena: Optional[EmbeddingArena] = field(default=None, repr=False, compare=False)
+    embedding_index: Optional[int] = None
     
-    def generate_prompt(self, level: str, current_understanding: Dict) -> str:
-        """Generate appropriate prompt based on expertise."""
-        if level == 'observation':
-            return self._generate_observation_prompt()
-        elif level == 'pattern':
-            return self._generate_pattern_prompt()
-        elif level == 'concept':
-            return self._generate_concept_prompt()
-        else:  # principle
-            return self._generate_principle_prompt()
-    
-    def _generate_observation_prompt(self) -> str:
-        if self.name == 'socratic':
-            return np.random.choice([
-                "What specific examples come to mind?",
-                "Could you describe that in more detail?",
-                "How did you arrive at that observation?"
-            ])
-        elif self.name == 'constructivist':
-            return np.random.choice([
-                "How does this connect to your prior knowledge?",
-                "What similar experiences have you had?",
-                "How would you explain this to a peer?"
-            ])
-        else:  # experiential
-            return np.random.choice([
-                "What practical situations reflect this?",
-                "How have you applied this in practice?",
-                "What concrete examples illustrate this?"
-            ])
-    
-    def _generate_pattern_prompt(self) -> str:
-        if self.name == 'socratic':
-            return np.random.choice([
-                "What patterns do you notice emerging?",
-                "How do these observations relate to each other?",
-                "What common threads do you see?"
-            ])
-        elif self.name == 'constructivist':
-            return np.random.choice([
-                "How might these patterns connect to broader concepts?",
-                "What underlying structure are you noticing?",
-                "How do these patterns build on each other?"
-            ])
-        else:  # experiential
-            return np.random.choice([
-                "How do these patterns manifest in practice?",
-                "What real-world situations follow this pattern?",
-                "How could we apply these patterns?"
-            ])
-    
-    def _generate_concept_prompt(self) -> str:
-        if self.name == 'socratic':
-            return np.random.choice([
-                "How might this concept apply more broadly?",
-                "What assumptions underlie this concept?",
-                "How would you test this concept?"
-            ])
-        elif self.name == 'constructivist':
-            return np.random.choice([
-                "How does this concept build on what we know?",
-                "What new understanding does this concept enable?",
-                "How might we extend this concept?"
-            ])
-        else:  # experiential
-            return np.random.choice([
-                "How would this concept work in practice?",
-                "What real situations exemplify this concept?",
-                "How could we apply this concept?"
-            ])
-    
-    def _generate_principle_prompt(self) -> str:
-        if self.name == 'socratic':
-            return np.random.choice([
-                "What broader implications does this principle have?",
-                "How might this principle generalize?",
-                "What evidence supports this principle?"
-            ])
-        elif self.name == 'constructivist':
-            return np.random.choice([
-                "How does this principle transform our understanding?",
-                "What new possibilities does this principle suggest?",
-                "How might this principle evolve further?"
-            ])
-        else:  # experiential
-            return np.random.choice([
-                "How could this principle guide practice?",
-                "What practical applications emerge from this principle?",
-                "How might we implement this principle?"
-            ])
+    def generate_prompt(self,
+                        level: str,
+                        current_understanding: Dict,
+                        rng: Optional[np.random.Generator] = None) -> str:
+        """Generate appropriate prompt based on expertise.
+        
+        Draws from ``rng`` when given, otherwise from the global NumPy RNG,
+        consuming it exactly as ``np.random.choice`` over the prompts would.
+        """
+        prompts = self._prompts(level)
+        index = rng.integers(len(prompts)) if rng is not None else np.random.randint(len(prompts))
+        return prompts[index]
+    
+    def generate_prompts(self,
+                         level: str,
+                         n: int,
+                         rng: Optional[np.random.Generator] = None) -> List[str]:
+        """Draw ``n`` prompts for a level in one call."""
+        prompts = self._prompts(level)
+        indices = (rng.integers(len(prompts), size=n) if rng is not None
+                   else np.random.randint(len(prompts), size=n))
+        return [prompts[i] for i in indices.tolist()]
+    
+    def _prompts(self, level: str) -> Tuple[str, ...]:
+        # Unknown levels get principle prompts and unknown sources the
+        # experiential ones
+        if level not in ('observation', 'pattern', 'concept'):
+            level = 'principle'
+        source = self.name if self.name in ('socratic', 'constructivist') else 'experiential'
+        return PROMPT_TABLE[(source, level)]
 
 @dataclass
-class Hypothesis:
+class Hypothesis(ArenaEmbedding):
     """Represents a potential understanding or concept."""
     content: str
     confidence: float
     supporting_sources: Set[str]
     timestamp: datetime
-    embedding: np.ndarray
+    embedding: Optional[np.ndarray]
+    arena: Optional[EmbeddingArena] = field(default=None, repr=False, compare=False)
+    embedding_index: Optional[int] = None
 
 @dataclass
 class BlackboardLevel:
-    """Represents a level of understanding in the blackboard."""
+    """Represents a level of understanding in the blackboard.
+    
+    Hypotheses added through ``add`` update a running sum of weighted
+    confidences and the index of the most confident hypothesis, so the
+    level confidence and best hypothesis are maintained in O(1) per insert.
+    """
     name: str
     hypotheses: List[Hypothesis] = field(default_factory=list)
     confidence: float = 0.0
+    weighted_confidence_sum: float = field(default=0.0, repr=False)
+    best_index: Optional[int] = field(default=None, repr=False)
+    # Arena row of each hypothesis' embedding, -1 where it has none
+    embedding_rows: List[int] = field(default_factory=list, repr=False)
+    # Similarity index owning the embeddings of the level's hypotheses
+    index: Optional[VectorIndex] = field(default=None, repr=False)
+    
+    def __post_init__(self):
+        if self.hypotheses and self.best_index is None:
+            self.best_index = int(np.argmax([h.confidence for h in self.hypotheses]))
+        if len(self.embedding_rows) != len(self.hypotheses):
+            self.embedding_rows = [
+                h.embedding_index if h.arena is not None else -1
+                for h in self.hypotheses
+            ]
+    
+    @property
+    def best_hypothesis(self) -> Optional[Hypothesis]:
+        """Most confident hypothesis (the earliest one on ties)."""
+        return self.hypotheses[self.best_index] if self.best_index is not None else None
+    
+    def add(self, hypothesis: Hypothesis, weighted_confidence: float) -> None:
+        """Append a hypothesis whose source-weighted confidence is given."""
+        self.hypotheses.append(hypothesis)
+        row = hypothesis.embedding_index if hypothesis.arena is not None else -1
+        self.embedding_rows.append(row)
+        if self.index is not None and hypothesis.arena is self.index.arena:
+            self.index.add(len(self.hypotheses) - 1, row)
+        self.weighted_confidence_sum += weighted_confidence
+        self.confidence = float(self.weighted_confidence_sum / len(self.hypotheses))
+        
+        best = self.best_hypothesis
+        if best is None or hypothesis.confidence > best.confidence:
+            self.best_index = len(self.hypotheses) - 1
+    
+    def build_index(self) -> None:
+        """Build the IVF index and point hypotheses at their moved rows."""
+        new_rows = self.index.build()
+        for position, row in enumerate(self.embedding_rows):
+            hypothesis = self.hypotheses[position]
+            if row >= 0 and hypothesis.arena is self.index.arena:
+                hypothesis.embedding_index = self.embedding_rows[position] = int(new_rows[row])
 
 class BlackboardSystem:
     """Implements core blackboard architecture for emergent understanding."""
     
-    def __init__(self):
+    def __init__(self,
+                 embedding_dtype=np.float32,
+                 rng: Optional[np.random.Generator] = None):
         logger.info("Initializing BlackboardSystem")
+        # Per-session RNG for prompt sampling; None uses the global NumPy RNG
+        self.rng = rng
+        # Source embeddings; hypotheses live in their level's index
+        self.embeddings = EmbeddingArena(dtype=embedding_dtype)
         self._initialize_knowledge_sources()
         self._initialize_levels()
     
@@ -153,6 +449,8 @@ class BlackboardSystem:
                 embedding=np.random.randn(768)
             )
         }
+        for source in self.knowledge_sources.values():
+            source.attach_embedding(self.embeddings)
         logger.info("Initialized knowledge sources")
 
 
@@ -176,7 +474,7 @@ class BlackboardSystem:
         source = self.knowledge_sources[source_name]
         
         # Generate appropriate prompt
-        prompt = source.generate_prompt(level, understanding)
+        prompt = source.generate_prompt(level, understanding, rng=self.rng)
         logger.info(f"Generated {source_name} prompt for {level} level")
         
         return prompt
@@ -185,32 +483,40 @@ class BlackboardSystem:
     def _initialize_levels(self):
         """Initialize blackboard levels."""
         self.levels = {
-            'observation': BlackboardLevel(name='observation'),
-            'pattern': BlackboardLevel(name='pattern'),
-            'concept': BlackboardLevel(name='concept'),
-            'principle': BlackboardLevel(name='principle')
+            name: BlackboardLevel(name=name, index=VectorIndex(dtype=self.embeddings.dtype))
+            for name in ('observation', 'pattern', 'concept', 'principle')
         }
         logger.info("Initialized blackboard levels")
     
     def add_hypothesis(self, level: str, hypothesis: Hypothesis) -> None:
         """Add a new hypothesis to a blackboard level."""
         if level in self.levels:
-            self.levels[level].hypotheses.append(hypothesis)
-            self._update_level_confidence(level)
+            blackboard_level = self.levels[level]
+            if hypothesis.get_embedding() is not None:
+                hypothesis.attach_embedding(self._level_arena(blackboard_level))
+            blackboard_level.add(hypothesis, self._weighted_confidence(hypothesis))
             logger.info(f"Added hypothesis to {level} level")
         else:
             logger.warning(f"Attempted to add hypothesis to unknown level: {level}")
     
+    def build_indexes(self, force: bool = False) -> None:
+        """Build the IVF index of every level that has grown enough.
+        
+        Indexes are never built on insert or query; call this between
+        bursts of inserts (or with ``force`` to rebuild every level).
+        """
+        for blackboard_level in self.levels.values():
+            index = blackboard_level.index
+            if index is not None and len(index) > 0 and (force or index.build_due):
+                blackboard_level.build_index()
+    
     def get_current_understanding(self) -> Dict:
         """Get the current state of understanding across levels."""
         understanding = {}
         for level_name, level in self.levels.items():
-            if level.hypotheses:
-                # Get most confident hypothesis at each level
-                best_hypothesis = max(
-                    level.hypotheses,
-                    key=lambda h: h.confidence
-                )
+            # Most confident hypothesis at each level, tracked on insert
+            best_hypothesis = level.best_hypothesis
+            if best_hypothesis is not None:
                 understanding[level_name] = {
                     'content': best_hypothesis.content,
                     'confidence': best_hypothesis.confidence,
@@ -220,6 +526,51 @@ class BlackboardSystem:
         logger.info(f"Current understanding spans {len(understanding)} levels")
         return understanding
     
+    def level_similarities(self, level: str, embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of an embedding with each hypothesis of a level.
+        
+        Hypotheses without an embedding get NaN.
+        """
+        blackboard_level = self.levels[level]
+        rows = np.asarray(blackboard_level.embedding_rows, dtype=np.intp)
+        similarities = np.full(len(rows), np.nan, dtype=np.float32)
+        if blackboard_level.index is not None:
+            positions, scores = blackboard_level.index.similarities(embedding)
+            similarities[positions] = scores
+        else:
+            has_embedding = rows >= 0
+            similarities[has_embedding] = self.embeddings.similarity(embedding, rows[has_embedding])
+        return similarities
+    
+    def query(self,
+              level: str,
+              embedding: np.ndarray,
+              k: int = 5) -> List[Tuple[Hypothesis, float]]:
+        """Top-k hypotheses of a level by cosine similarity to an embedding.
+        
+        Returns (hypothesis, similarity) pairs, most similar first. Levels
+        whose IVF index has been built (see ``build_indexes``) are searched
+        approximately.
+        """
+        if level not in self.levels:
+            logger.warning(f"Attempted to query unknown level: {level}")
+            return []
+        
+        blackboard_level = self.levels[level]
+        if blackboard_level.index is None:
+            similarities = self.level_similarities(level, embedding)
+            similarities = np.where(np.isnan(similarities), -np.inf, similarities)
+            positions = np.argsort(-similarities, kind='stable')[:k]
+            scores = similarities[positions]
+        else:
+            positions, scores = blackboard_level.index.search(embedding, k)
+        
+        return [
+            (blackboard_level.hypotheses[position], float(score))
+            for position, score in zip(positions.tolist(), scores.tolist())
+            if np.isfinite(score)
+        ]
+    
     def get_level_metrics(self) -> Dict:
         """Get metrics about current understanding levels."""
         metrics = {
@@ -242,19 +593,45 @@ class BlackboardSystem:
         
         return metrics
     
+    def _level_arena(self, blackboard_level: BlackboardLevel) -> EmbeddingArena:
+        """Arena for a level's hypothesis embeddings: its index's, if it has one."""
+        if blackboard_level.index is not None:
+            return blackboard_level.index.arena
+        return self.embeddings
+    
+    def _weighted_confidence(self, hypothesis: Hypothesis) -> float:
+        """Hypothesis confidence weighted by its supporting sources' mean confidence."""
+        source_confidence = np.mean([
+            self.knowledge_sources[source].confidence
+            for source in hypothesis.supporting_sources
+            if source in self.knowledge_sources
+        ])
+        return hypothesis.confidence * source_confidence
+    
     def _update_level_confidence(self, level: str) -> None:
-        """Update confidence for a blackboard level."""
-        if not self.levels[level].hypotheses:
-            self.levels[level].confidence = 0.0
+        """Recompute a level's running statistics from all of its hypotheses.
+        
+        ``add_hypothesis`` keeps these up to date incrementally; this is only
+        needed after hypotheses or source confidences are changed in place.
+        """
+        blackboard_level = self.levels[level]
+        hypotheses = blackboard_level.hypotheses
+        if not hypotheses:
+            blackboard_level.confidence = 0.0
+            blackboard_level.weighted_confidence_sum = 0.0
+            blackboard_level.best_index = None
+            blackboard_level.embedding_rows = []
             return
             
-        confidences = []
-        for hypothesis in self.levels[level].hypotheses:
-            source_confidence = np.mean([
-                self.knowledge_sources[source].confidence
-                for source in hypothesis.supporting_sources
-                if source in self.knowledge_sources
-            ])
-            confidences.append(hypothesis.confidence * source_confidence)
-            
-        self.levels[level].confidence = float(np.mean(confidences))
\ No newline at end of file
+        confidences = [self._weighted_confidence(h) for h in hypotheses]
+        blackboard_level.weighted_confidence_sum = float(np.sum(confidences))
+        blackboard_level.confidence = float(np.mean(confidences))
+        blackboard_level.best_index = int(np.argmax([h.confidence for h in hypotheses]))
+        blackboard_level.index = VectorIndex(dtype=self.embeddings.dtype)
+        blackboard_level.embedding_rows = [
+            h.attach_embedding(blackboard_level.index.arena) if h.get_embedding() is not None else -1
+            for h in hypotheses
+        ]
+        for position, row in enumerate(blackboard_level.embedding_rows):
+            if row >= 0:
+                blackboard_level.index.add(position, row)
@@ -1,41 +1,102 @@
 # File: prototype/models/curriculum_design.py
 
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 import json
 from pathlib import Path
 from datetime import datetime
+from prototype.models.embedding_registry import EmbeddingRegistry
 
 class CurriculumDesigner:
-    """Emergent curriculum design based on pattern analysis."""
+    """Emergent curriculum design based on pattern analysis.
     
-    def __init__(self):
-        self.concept_embeddings = {
-            'critical_thinking': np.random.randn(768),
-            'problem_solving': np.random.randn(768),
-            'metacognition': np.random.randn(768),
-            'active_learning': np.random.randn(768)
-        }
+    Concept and scaffold embeddings come from an ``EmbeddingRegistry`` (or a
+    registry directory); without one, the four built-in concepts and
+    scaffolds get seeded random embeddings (``EmbeddingRegistry.default``).
+    """
+    
+    def __init__(self,
+                 registry: Optional[Union[str, Path, EmbeddingRegistry]] = None,
+                 top_k: int = 2):
+        if registry is None:
+            registry = EmbeddingRegistry.default()
+        elif not isinstance(registry, EmbeddingRegistry):
+            registry = EmbeddingRegistry(registry)
         
-        self.scaffold_embeddings = {
-            'experiential': np.random.randn(768),
-            'collaborative': np.random.randn(768),
-            'inquiry_based': np.random.randn(768),
-            'reflective': np.random.randn(768)
-        }
+        # The registry keeps unit-normalized concept and scaffold embeddings
+        # stacked as rows, so all alignments come from one matrix product
+        self.registry = registry
+        self.top_k = top_k
+        
+        # Running state for partial_fit / finalize
+        self.reset()
+    
+    @property
+    def concept_embeddings(self) -> Dict[str, np.ndarray]:
+        """Unit concept embeddings by name."""
+        return dict(zip(self.registry.concept_names, self.registry.vectors[:self.registry.n_concepts]))
+    
+    @property
+    def scaffold_embeddings(self) -> Dict[str, np.ndarray]:
+        """Unit scaffold embeddings by name."""
+        return dict(zip(self.registry.scaffold_names, self.registry.vectors[self.registry.n_concepts:]))
+
+    def reset(self) -> None:
+        """Forget all embeddings seen through ``partial_fit``."""
+        self.similarity_sums = np.zeros(len(self.registry))
+        self.n_embeddings = 0
+    
+    def partial_fit(self,
+                    batch: Union[Sequence[np.ndarray], np.ndarray],
+                    batch_size: int = 65_536) -> 'CurriculumDesigner':
+        """Add a batch of session embeddings to the running alignment sums.
+        
+        Only per-target similarity sums and a count are kept, so designs can
+        be built over streams larger than memory, e.g. slices of an .npy
+        memmap fed in one at a time.
+        """
+        if len(batch) == 0:
+            return self
+        
+        self.similarity_sums += self._accumulate_similarities(batch, batch_size)
+        self.n_embeddings += len(batch)
+        return self
+    
+    def finalize(self) -> Dict:
+        """Curriculum design from all embeddings seen so far.
+        
+        The running sums are kept, so this can be called again after more
+        ``partial_fit`` batches.
+        """
+        if self.n_embeddings == 0:
+            return self._generate_default_design()
+        
+        return self._design_from_alignments(self.similarity_sums / self.n_embeddings)
 
-    def analyze_patterns(self, session_embeddings: List[np.ndarray]) -> Dict:
-        """Analyze emergent patterns to identify learning progression."""
-        if not session_embeddings:
+    def analyze_patterns(self,
+                         session_embeddings: Union[Sequence[np.ndarray], np.ndarray],
+                         batch_size: int = 65_536) -> Dict:
+        """Analyze emergent patterns to identify learning progression.
+        
+        ``session_embeddings`` may be a list of vectors or an (n, 768) array,
+        including a float32 array or ``np.memmap``; arrays are scored
+        ``batch_size`` rows at a time without being copied as a whole.
+        """
+        if len(session_embeddings) == 0:
             return self._generate_default_design()
-            
+        
+        similarity_sums = self._accumulate_similarities(session_embeddings, batch_size)
+        return self._design_from_alignments(similarity_sums / len(session_embeddings))
+    
+    def _design_from_alignments(self, alignments: np.ndarray) -> Dict:
+        """Build a design from mean alignments with every concept and scaffold."""
+        n_concepts = self.registry.n_concepts
+        
         # Find dominant concepts
-        concept_alignments = self._compute_concept_alignments(session_embeddings)
-        primary_concepts = self._extract_primary_concepts(concept_alignments)
+        primary_concepts = self._extract_primary_concepts(alignments[:n_concepts])
         
         # Identify effective scaffolding approaches
-        scaffold_alignments = self._compute_scaffold_alignments(session_embeddings)
-        effective_scaffolds = self._extract_effective_scaffolds(scaffold_alignments)
+        effective_scaffolds = self._extract_effective_scaffolds(alignments[n_concepts:])
         
         return {
             'timestamp': datetime.now().isoformat(),
@@ -47,58 +108,47 @@ class CurriculumDesigner:
             )
         }
     
-    def _compute_concept_alignments(self, embeddings: List[np.ndarray]) -> Dict[str, float]:
-        """Compute alignment with core learning concepts."""
-        alignments = {}
-        for name, concept_emb in self.concept_embeddings.items():
-            similarities = [
-                np.dot(emb, concept_emb) / (np.linalg.norm(emb) * np.linalg.norm(concept_emb))
-                for emb in embeddings
-            ]
-            alignments[name] = float(np.mean(similarities))
-        return alignments
+    def _accumulate_similarities(self,
+                                 embeddings: Union[Sequence[np.ndarray], np.ndarray],
+                                 batch_size: int) -> np.ndarray:
+        """Per-target sums of cosine similarity over all embeddings."""
+        if not isinstance(embeddings, np.ndarray):
+            embeddings = np.stack(embeddings)
+        
+        similarity_sums = np.zeros(len(self.registry))
+        for start in range(0, len(embeddings), batch_size):
+            similarity_sums += self._similarity_sums(embeddings[start:start + batch_size])
+        return similarity_sums
     
-    def _compute_scaffold_alignments(self, embeddings: List[np.ndarray]) -> Dict[str, float]:
-        """Compute alignment with scaffolding approaches."""
-        alignments = {}
-        for name, scaffold_emb in self.scaffold_embeddings.items():
-            similarities = [
-                np.dot(emb, scaffold_emb) / (np.linalg.norm(emb) * np.linalg.norm(scaffold_emb))
-                for emb in embeddings
-            ]
-            alignments[name] = float(np.mean(similarities))
-        return alignments
+    def _similarity_sums(self, batch: np.ndarray) -> np.ndarray:
+        """Per-target sums of cosine similarity over a batch of embeddings."""
+        # float32 batches are scored in float32; sums are accumulated in float64
+        targets = self.registry.vectors_as(np.float32 if batch.dtype == np.float32 else np.float64)
+        similarities = (batch @ targets.T) / np.linalg.norm(batch, axis=1)[:, None]
+        return similarities.sum(axis=0, dtype=np.float64)
     
-    def _extract_primary_concepts(self, alignments: Dict[str, float]) -> List[Dict]:
+    def _extract_primary_concepts(self, alignments: np.ndarray) -> List[Dict]:
         """Extract primary concepts based on alignment strength."""
-        sorted_concepts = sorted(
-            alignments.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        names = self.registry.concept_names
         return [
             {
-                'concept': concept,
-                'strength': float(strength),
-                'objectives': self._generate_objectives(concept)
+                'concept': names[index],
+                'strength': float(alignments[index]),
+                'objectives': self._generate_objectives(names[index])
             }
-            for concept, strength in sorted_concepts[:2]
+            for index in _top_k(alignments, self.top_k)
         ]
     
-    def _extract_effective_scaffolds(self, alignments: Dict[str, float]) -> List[Dict]:
+    def _extract_effective_scaffolds(self, alignments: np.ndarray) -> List[Dict]:
         """Extract most effective scaffolding approaches."""
-        sorted_scaffolds = sorted(
-            alignments.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        names = self.registry.scaffold_names
         return [
             {
-                'approach': approach,
-                'effectiveness': float(strength),
-                'activities': self._generate_activities(approach)
+                'approach': names[index],
+                'effectiveness': float(alignments[index]),
+                'activities': self._generate_activities(names[index])
             }
-            for approach, strength in sorted_scaffolds[:2]
+            for index in _top_k(alignments, self.top_k)
         ]
     
     def _generate_learning_sequence(self, 
@@ -200,4 +250,12 @@ class CurriculumDesigner:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         with open(output_dir / 'curriculum_design.json', 'w') as f:
-            json.dump(design, f, indent=2)
\ No newline at end of file
+            json.dump(design, f, indent=2)
+
+def _top_k(values: np.ndarray, k: int) -> List[int]:
+    """Indices of the k largest values, largest first (earliest first on ties)."""
+    k = min(k, len(values))
+    if k <= 0:
+        return []
+    top = np.argpartition(-values, k - 1)[:k]
+    return top[np.lexsort((top, -values[top]))].tolist()
@@ -0,0 +1,144 @@
+# File: prototype/models/embedding_registry.py
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_VERSION = 1
+META_FILE = 'meta.json'
+
+# Built-in targets used when no registry is supplied
+DEFAULT_CONCEPTS = ('critical_thinking', 'problem_solving', 'metacognition', 'active_learning')
+DEFAULT_SCAFFOLDS = ('experiential', 'collaborative', 'inquiry_based', 'reflective')
+
+def build_embedding_registry(registry_dir: Union[str, Path],
+                             concepts: Dict[str, np.ndarray],
+                             scaffolds: Dict[str, np.ndarray]) -> Path:
+    """Write concept and scaffold embeddings as a versioned registry directory.
+
+    Vectors are unit-normalized and stored as one contiguous float32 matrix
+    in ``vectors.npy`` (concepts first, then scaffolds), with their names in
+    ``names.json``.
+    """
+    registry_dir = Path(registry_dir)
+    registry_dir.mkdir(parents=True, exist_ok=True)
+
+    vectors = _normalize(np.stack(list(concepts.values()) + list(scaffolds.values())))
+    np.save(registry_dir / 'vectors.npy', vectors.astype(np.float32))
+    with open(registry_dir / 'names.json', 'w') as f:
+        json.dump(list(concepts) + list(scaffolds), f)
+    with open(registry_dir / META_FILE, 'w') as f:
+        json.dump({
+            'version': REGISTRY_VERSION,
+            'dim': vectors.shape[1],
+            'n_concepts': len(concepts),
+            'n_scaffolds': len(scaffolds)
+        }, f, indent=2)
+
+    logger.info(f"Wrote {len(concepts)} concepts and {len(scaffolds)} scaffolds to {registry_dir}")
+    return registry_dir
+
+class EmbeddingRegistry:
+    """Unit-normalized concept and scaffold embeddings in one contiguous matrix.
+
+    A registry is either opened from a directory written by
+    ``build_embedding_registry``, in which case the vectors are memory-mapped
+    on first use, or built in memory with ``from_embeddings``.
+    """
+
+    def __init__(self, registry_dir: Optional[Union[str, Path]] = None):
+        self.registry_dir = Path(registry_dir) if registry_dir is not None else None
+        self._vectors = None
+        self._converted: Dict[np.dtype, np.ndarray] = {}
+
+        if self.registry_dir is not None:
+            with open(self.registry_dir / META_FILE) as f:
+                meta = json.load(f)
+            if meta.get('version') != REGISTRY_VERSION:
+                raise ValueError(
+                    f"Embedding registry {self.registry_dir} has version {meta.get('version')}, "
+                    f"expected {REGISTRY_VERSION}"
+                )
+            with open(self.registry_dir / 'names.json') as f:
+                self.names: List[str] = json.load(f)
+            self.dim = meta['dim']
+            self.n_concepts = meta['n_concepts']
+
+    @classmethod
+    def from_embeddings(cls,
+                        concepts: Dict[str, np.ndarray],
+                        scaffolds: Dict[str, np.ndarray]) -> 'EmbeddingRegistry':
+        """In-memory registry from name-to-vector mappings."""
+        registry = cls()
+        registry._vectors = _normalize(np.stack(list(concepts.values()) + list(scaffolds.values())))
+        registry.names = list(concepts) + list(scaffolds)
+        registry.dim = registry._vectors.shape[1]
+        registry.n_concepts = len(concepts)
+        return registry
+
+    @classmethod
+    def default(cls, dim: int = 768, seed: int = 0) -> 'EmbeddingRegistry':
+        """Built-in concepts and scaffolds with seeded random embeddings.
+
+        The same ``seed`` always gives the same vectors, so designs made
+        without a registry are reproducible across runs.
+        """
+        rng = np.random.default_rng(seed)
+        return cls.from_embeddings(
+            {name: rng.standard_normal(dim) for name in DEFAULT_CONCEPTS},
+            {name: rng.standard_normal(dim) for name in DEFAULT_SCAFFOLDS}
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """All unit vectors, concepts first; loaded lazily from disk."""
+        if self._vectors is None:
+            self._vectors = np.load(self.registry_dir / 'vectors.npy', mmap_mode='r')
+        return self._vectors
+
+    @property
+    def concept_names(self) -> List[str]:
+        return self.names[:self.n_concepts]
+
+    @property
+    def scaffold_names(self) -> List[str]:
+        return self.names[self.n_concepts:]
+
+    def vectors_as(self, dtype) -> np.ndarray:
+        """The vector matrix in a given dtype, converted once and cached."""
+        dtype = np.dtype(dtype)
+        if self.vectors.dtype == dtype:
+            return self.vectors
+        if dtype not in self._converted:
+            self._converted[dtype] = np.ascontiguousarray(self.vectors, dtype=dtype)
+        return self._converted[dtype]
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description='Build a random concept/scaffold embedding registry')
+    parser.add_argument('registry_dir', type=str, help='Output directory for the registry')
+    parser.add_argument('--n_concepts', type=int, default=4, help='Number of concepts')
+    parser.add_argument('--n_scaffolds', type=int, default=4, help='Number of scaffolds')
+    parser.add_argument('--dim', type=int, default=768, help='Embedding dimension')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    build_embedding_registry(
+        args.registry_dir,
+        {f"concept_{i}": rng.standard_normal(args.dim) for i in range(args.n_concepts)},
+        {f"scaffold_{i}": rng.standard_normal(args.dim) for i in range(args.n_scaffolds)}
+    )
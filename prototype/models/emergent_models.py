@@ -1,7 +1,8 @@
 # File: prototype/models/emergent_models.py
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set
+from typing import Deque, List, Dict, Optional, Set, Union
 from datetime import datetime
 import numpy as np
 
@@ -21,6 +22,7 @@ class EmergentPattern:
     coherence: float
     timestamp: datetime = field(default_factory=datetime.now)
     related_patterns: Set[int] = field(default_factory=set)
+    pattern_id: Optional[int] = None
     
     def evolve(self, influence: np.ndarray, learning_rate: float = 0.1) -> None:
         """Evolve pattern based on new influence."""
@@ -37,38 +39,133 @@ class EmergentPattern:
 
 @dataclass
 class DynamicState:
-    """Represents the dynamic state of the learning system."""
+    """Represents the dynamic state of the learning system.
+    
+    The unit-normalized pattern matrix and the complexity are memoized and
+    recomputed only when ``active_patterns`` changes: patterns added or
+    removed, or a pattern's embedding replaced (as ``evolve`` does).
+    """
     timestamp: datetime
     embedding: np.ndarray
     active_patterns: List[EmergentPattern]
     stability: float = 0.0
+    # Embedding arrays the cache was computed from; holding them keeps
+    # identity comparisons valid
+    _cached_embeddings: Optional[List[np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    _pattern_matrix: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _complexity: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def pattern_matrix(self) -> np.ndarray:
+        """Unit-normalized active pattern embeddings, one row per pattern."""
+        self._refresh_cache()
+        return self._pattern_matrix
     
     @property
     def complexity(self) -> float:
         """Measure state complexity through pattern interactions."""
         if not self.active_patterns:
             return 0.0
-        n = len(self.active_patterns)
-        interactions = np.zeros((n, n))
-        for i, p1 in enumerate(self.active_patterns):
-            for j, p2 in enumerate(self.active_patterns):
-                if i != j:
-                    interactions[i,j] = p1.similarity(p2)
-        return float(np.mean(np.abs(interactions)))
+        self._refresh_cache()
+        if self._complexity is None:
+            # Mean absolute cosine similarity over all ordered pairs, with
+            # the self-similarities on the diagonal counted as zero
+            interactions = self._pattern_matrix @ self._pattern_matrix.T
+            np.fill_diagonal(interactions, 0.0)
+            self._complexity = float(np.mean(np.abs(interactions)))
+        return self._complexity
+    
+    def _refresh_cache(self) -> None:
+        embeddings = [p.embedding for p in self.active_patterns]
+        if (self._cached_embeddings is not None and
+                len(embeddings) == len(self._cached_embeddings) and
+                all(a is b for a, b in zip(embeddings, self._cached_embeddings))):
+            return
+        if embeddings:
+            matrix = np.stack(embeddings)
+            self._pattern_matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        else:
+            self._pattern_matrix = np.empty((0, len(self.embedding)))
+        self._complexity = None
+        self._cached_embeddings = embeddings
+
+@dataclass
+class RunningStats:
+    """Online mean and variance (Welford's algorithm)."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    @property
+    def variance(self) -> float:
+        """Population variance of the values added so far."""
+        return self.m2 / self.count if self.count else 0.0
+    
+    def merged(self, other: 'RunningStats') -> 'RunningStats':
+        """Statistics over the values of both accumulators."""
+        count = self.count + other.count
+        if not count:
+            return RunningStats()
+        delta = other.mean - self.mean
+        return RunningStats(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta ** 2 * self.count * other.count / count
+        )
 
 @dataclass
 class EmergentSession:
-    """Represents a complete learning session with emergent dynamics."""
+    """Represents a complete learning session with emergent dynamics.
+    
+    With ``max_history`` set, only the last ``max_history`` interactions and
+    states are kept (in ring buffers), together with the pattern evolution
+    entries of the retained states. Session metrics still cover every
+    interaction: quality comes from a running accumulator, and complexity is
+    recomputed over the retained states (so ``EmergentPattern.evolve`` is
+    reflected) and combined with an accumulator of the states already
+    dropped, each counted with its complexity at the time it left.
+    
+    Patterns are identified by the ``'id'`` of their interaction pattern
+    entry; patterns without one fall back to a hash of their embedding
+    bytes, so repeated embeddings still group together.
+    """
     id: str
     timestamp: datetime
-    interactions: List[DynamicInteraction] = field(default_factory=list)
-    state_history: List[DynamicState] = field(default_factory=list)
+    interactions: Union[List[DynamicInteraction], Deque[DynamicInteraction]] = field(default_factory=list)
+    state_history: Union[List[DynamicState], Deque[DynamicState]] = field(default_factory=list)
     pattern_evolution: Dict[int, List[EmergentPattern]] = field(default_factory=dict)
+    max_history: Optional[int] = None
+    quality_stats: RunningStats = field(default_factory=RunningStats, repr=False)
+    dropped_complexity_stats: RunningStats = field(default_factory=RunningStats, repr=False)
+    
+    def __post_init__(self):
+        if self.max_history is not None and self.max_history < 1:
+            raise ValueError(f"max_history must be None or at least 1, got {self.max_history}")
+        
+        for interaction in self.interactions:
+            self.quality_stats.add(interaction.quality)
+        
+        if self.max_history is not None:
+            for state in list(self.state_history)[:-self.max_history]:
+                self.dropped_complexity_stats.add(state.complexity)
+            self.interactions = deque(self.interactions, maxlen=self.max_history)
+            self.state_history = deque(self.state_history, maxlen=self.max_history)
     
     def add_interaction(self, interaction: DynamicInteraction) -> None:
         """Add new interaction and update state."""
         self.interactions.append(interaction)
+        self.quality_stats.add(interaction.quality)
+        
         state = self._compute_state(interaction)
+        if self.max_history is not None and len(self.state_history) == self.max_history:
+            self.dropped_complexity_stats.add(self.state_history[0].complexity)
+            self._forget_patterns(self.state_history[0])
         self.state_history.append(state)
         self._update_patterns(state)
     
@@ -88,7 +185,8 @@ class EmergentSession:
             pattern = EmergentPattern(
                 embedding=p['embedding'],
                 strength=p['strength'],
-                coherence=p['coherence']
+                coherence=p['coherence'],
+                pattern_id=p['id'] if 'id' in p else hash(p['embedding'].tobytes())
             )
             patterns.append(pattern)
         return patterns
@@ -96,25 +194,37 @@ class EmergentSession:
     def _update_patterns(self, state: DynamicState) -> None:
         """Update pattern evolution."""
         for pattern in state.active_patterns:
-            pattern_id = hash(pattern.embedding.tobytes())
-            if pattern_id not in self.pattern_evolution:
-                self.pattern_evolution[pattern_id] = []
-            self.pattern_evolution[pattern_id].append(pattern)
+            self.pattern_evolution.setdefault(pattern.pattern_id, []).append(pattern)
+    
+    def _forget_patterns(self, state: DynamicState) -> None:
+        """Drop the pattern evolution entries of a state leaving the history."""
+        # States leave in insertion order, so each pattern's entry from this
+        # state is the oldest one in its list
+        for pattern in state.active_patterns:
+            evolution = self.pattern_evolution.get(pattern.pattern_id)
+            if evolution:
+                evolution.pop(0)
+                if not evolution:
+                    del self.pattern_evolution[pattern.pattern_id]
     
     def get_session_metrics(self) -> Dict:
         """Calculate session metrics from emergent patterns."""
-        if not self.interactions:
+        if not self.quality_stats.count:
             return {
                 "num_interactions": 0,
                 "avg_quality": 0.0,
                 "complexity": 0.0
             }
         
-        qualities = [i.quality for i in self.interactions]
-        complexities = [s.complexity for s in self.state_history]
+        complexity_stats = RunningStats()
+        for state in self.state_history:
+            complexity_stats.add(state.complexity)
+        complexity_stats = self.dropped_complexity_stats.merged(complexity_stats)
         
         return {
-            "num_interactions": len(self.interactions),
-            "avg_quality": float(np.mean(qualities)),
-            "complexity": float(np.mean(complexities))
-        }
\ No newline at end of file
+            "num_interactions": self.quality_stats.count,
+            "avg_quality": float(self.quality_stats.mean),
+            "quality_variance": float(self.quality_stats.variance),
+            "complexity": float(complexity_stats.mean),
+            "complexity_variance": float(complexity_stats.variance)
+        }
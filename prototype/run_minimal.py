@@ -2,7 +2,8 @@
 
 import logging
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
 from .validation_setup import ValidationFramework, convert_to_serializable
 from .simulation.blackboard_interaction import BlackboardSession, LearningInteraction
 from .simulation.transcript_generator import TranscriptGenerator
@@ -13,8 +14,20 @@ import pandas as pd
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_minimal_prototype(ednet_path: str, output_dir: str = "results") -> Dict:
-    """Run prototype with blackboard-based learning."""
+LEARNING_LEVELS = ['observation', 'pattern', 'concept', 'principle']
+INTERACTIONS_PER_LEVEL = (3, 5)  # randint bounds: 3-4 events per level
+
+def run_minimal_prototype(ednet_path: str,
+                          output_dir: str = "results",
+                          per_student_sessions: bool = False,
+                          n_workers: Optional[int] = None,
+                          seed: Optional[int] = None) -> Dict:
+    """Run prototype with blackboard-based learning.
+    
+    With ``per_student_sessions`` every experimental student gets their own
+    blackboard trajectory (see ``run_pss_per_student``), seeded from ``seed``,
+    and no shared session transcript is written.
+    """
     logger.info("Initializing minimal prototype...")
     output_path = Path(output_dir)
     
@@ -28,16 +41,19 @@ def run_minimal_prototype(ednet_path: str, output_dir: str = "results") -> Dict:
     
     # Run PSS with blackboard
     logger.info("Running PSS with blackboard system...")
-    pss_results, session = run_pss_curriculum(experimental_group)
-    
-    # Generate transcript
-    logger.info("Generating session transcript...")
-    transcript_gen = TranscriptGenerator()
-    transcript_gen.save_transcript(
-        session=session,
-        topic="Metacognition in Learning",
-        output_dir=output_path
-    )
+    if per_student_sessions:
+        pss_results, _ = run_pss_per_student(experimental_group, n_workers=n_workers, seed=seed)
+    else:
+        pss_results, session = run_pss_curriculum(experimental_group)
+        
+        # Generate transcript
+        logger.info("Generating session transcript...")
+        transcript_gen = TranscriptGenerator()
+        transcript_gen.save_transcript(
+            session=session,
+            topic="Metacognition in Learning",
+            output_dir=output_path
+        )
     
     # Run validation
     logger.info("Running validation analysis...")
@@ -51,6 +67,104 @@ def run_minimal_prototype(ednet_path: str, output_dir: str = "results") -> Dict:
     
     return validation_results
 
+# Per-process state for Monte Carlo workers, filled by _init_replicate_worker
+_worker_state: Dict = {}
+
+def run_monte_carlo(ednet_path: str,
+                    output_dir: str = "results",
+                    n_replicates: int = 100,
+                    n_workers: Optional[int] = None,
+                    seed: Optional[int] = None,
+                    confidence: float = 0.95) -> Dict:
+    """Run independently seeded replicates of both arms and aggregate them.
+    
+    Each worker process loads the dataset and computes the per-student
+    statistics once; each replicate it runs reseeds the RNG, re-splits the
+    students into groups and reruns the curricula and the validation analysis.
+    """
+    logger.info(f"Running {n_replicates} Monte Carlo replicates...")
+    output_path = Path(output_dir)
+    replicate_seeds = np.random.SeedSequence(seed).generate_state(n_replicates)
+    
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_init_replicate_worker,
+                             initargs=(ednet_path, output_path)) as executor:
+        replicates = list(executor.map(
+            _run_replicate,
+            replicate_seeds.tolist(),
+            chunksize=max(1, n_replicates // (4 * (n_workers or 1)))
+        ))
+    
+    summary = aggregate_replicates(replicates, confidence)
+    summary['n_replicates'] = n_replicates
+    summary['confidence'] = confidence
+    
+    output_path.mkdir(parents=True, exist_ok=True)
+    with open(output_path / 'monte_carlo_results.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+    logger.info(f"Saved Monte Carlo summary to {output_path / 'monte_carlo_results.json'}")
+    
+    return summary
+
+def _init_replicate_worker(ednet_path: str, output_path: Path) -> None:
+    """Load the dataset and compute the per-student statistics once per worker."""
+    validator = ValidationFramework(ednet_path, output_path)
+    validator.load_data()
+    _worker_state.update(
+        validator=validator,
+        student_stats=validator.student_statistics()
+    )
+
+def _run_replicate(seed: int) -> Dict:
+    """Run one seeded replicate of both arms and validate it.
+    
+    The students are re-split into control and experimental groups with the
+    replicate seed, so the spread across replicates includes group assignment.
+    """
+    np.random.seed(seed)
+    control_group, experimental_group = ValidationFramework.split_groups(
+        _worker_state['student_stats'],
+        random_state=seed
+    )
+    traditional_results = run_traditional_curriculum(control_group)
+    pss_results, _ = run_pss_curriculum(experimental_group)
+    return _worker_state['validator'].run_validation(
+        pss_results,
+        traditional_results,
+        save=False
+    )
+
+def aggregate_replicates(replicates: List[Dict], confidence: float = 0.95) -> Dict:
+    """Summarize per-replicate validation dictionaries as distributions.
+    
+    Numeric entries get mean, std and a percentile interval (or a
+    ``zero_variance`` flag when every replicate agrees), booleans the
+    fraction of replicates where they hold, and labels their counts.
+    """
+    tail = (1 - confidence) / 2 * 100
+    summary = {}
+    for key, value in replicates[0].items():
+        values = [replicate[key] for replicate in replicates]
+        if isinstance(value, dict):
+            summary[key] = aggregate_replicates(values, confidence)
+        elif isinstance(value, bool):
+            summary[key] = {'fraction_true': float(np.mean(values))}
+        elif isinstance(value, (int, float)):
+            summary[key] = {
+                'mean': float(np.mean(values)),
+                'std': float(np.std(values))
+            }
+            if np.ptp(values) == 0:
+                # Identical in every replicate; an interval would be meaningless
+                summary[key]['zero_variance'] = True
+            else:
+                summary[key]['ci_lower'] = float(np.percentile(values, tail))
+                summary[key]['ci_upper'] = float(np.percentile(values, 100 - tail))
+        else:
+            labels, counts = np.unique([str(v) for v in values], return_counts=True)
+            summary[key] = {'counts': dict(zip(labels.tolist(), counts.tolist()))}
+    return summary
+
 def run_traditional_curriculum(group: pd.DataFrame) -> Dict:
     """Run traditional curriculum for control group."""
     # Extract relevant metrics
@@ -65,19 +179,34 @@ def run_traditional_curriculum(group: pd.DataFrame) -> Dict:
         'time_to_mastery': time_to_mastery.tolist()
     }
 
-def run_pss_curriculum(group: pd.DataFrame) -> tuple[Dict, BlackboardSession]:
-    """Run PSS curriculum using blackboard architecture."""
-    # Initialize blackboard session
-    session = BlackboardSession()
-    interaction = LearningInteraction()
+def run_pss_curriculum(group: pd.DataFrame,
+                       understanding: Optional[np.ndarray] = None
+                       ) -> tuple[Dict, Optional[BlackboardSession]]:
+    """Run PSS curriculum using blackboard architecture.
     
-    # Process each student through learning levels
-    levels = ['observation', 'pattern', 'concept', 'principle']
+    By default one blackboard session is run and its final understanding
+    applies to every student. A per-student ``understanding`` array (e.g. a
+    column of ``simulate_understanding``) is applied as given instead; no
+    session is run then and ``None`` is returned in its place.
+    """
+    if understanding is not None:
+        return apply_understanding(group, understanding), None
+    
+    # Initialize blackboard session, storing its events column-wise
+    session = BlackboardSession.columnar()
+    understanding = _run_blackboard_session(session)
+    
+    return apply_understanding(group, understanding), session
+
+def _run_blackboard_session(session: BlackboardSession) -> float:
+    """Run one event stream through the learning levels; return its understanding."""
+    interaction = LearningInteraction()
     understanding = 0.0
     
-    for level in levels:
+    # Process each student through learning levels
+    for level in LEARNING_LEVELS:
         # Generate 3-4 interactions per level
-        for _ in range(np.random.randint(3, 5)):
+        for _ in range(np.random.randint(*INTERACTIONS_PER_LEVEL)):
             # Generate learning event
             event = interaction.generate_event(level, understanding)
             
@@ -93,31 +222,116 @@ def run_pss_curriculum(group: pd.DataFrame) -> tuple[Dict, BlackboardSession]:
             # Add to session
             session.add_event(event)
     
-    # Calculate metrics based on learning progression
-    final_scores = []
-    completion_rates = []
-    mastery_times = []
+    return understanding
+
+def run_pss_per_student(group: pd.DataFrame,
+                        n_workers: Optional[int] = None,
+                        chunk_size: int = 10_000,
+                        seed: Optional[int] = None) -> tuple[Dict, Dict[str, np.ndarray]]:
+    """Run PSS with an individual blackboard trajectory per student.
     
-    # Process each student
-    for idx in range(len(group)):
-        base_score = group['correct']['mean'].values[idx]
-        base_time = group['elapsed_time']['mean'].values[idx]
-        
-        # Apply understanding-based improvements
-        improvement = 1.0 + (understanding * 0.4)  # Up to 40% improvement
-        time_reduction = 1.0 - (understanding * 0.3)  # Up to 30% time reduction
-        
-        final_scores.append(base_score * improvement)
-        completion_rates.append(min(1.0, understanding * 1.2))
-        mastery_times.append(base_time * time_reduction)
-    
-    results = {
-        'scores': final_scores,
-        'completion_rates': completion_rates,
-        'time_to_mastery': mastery_times
+    Each student's trajectory starts from a prior understanding derived
+    from their accuracy and pace (see ``_prior_understanding``) and is
+    simulated by ``simulate_understanding``, in seeded chunks on a process
+    pool. Under the current gain rule final understanding reaches 1.0 for
+    every student by the end of the third level, so outcomes are computed
+    from the mean understanding over the four levels instead: students who
+    start lower or draw fewer early interactions finish the first levels
+    behind. The spread this leaves is small. Returns the outcome metrics and
+    the per-student trajectories (final, per-level and mean understanding).
+    """
+    prior_understanding = _prior_understanding(group)
+    chunks = [prior_understanding[start:start + chunk_size]
+              for start in range(0, len(prior_understanding), chunk_size)]
+    chunk_seeds = np.random.SeedSequence(seed).generate_state(len(chunks))
+    
+    logger.info(f"Simulating {len(group)} student trajectories in {len(chunks)} chunks...")
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        level_understanding = list(executor.map(
+            _simulate_chunk, chunks, chunk_seeds.tolist()
+        ))
+    
+    level_understanding = (np.concatenate(level_understanding) if level_understanding
+                           else np.empty((0, len(LEARNING_LEVELS))))
+    mean_understanding = level_understanding.mean(axis=1)
+    trajectories = {
+        'understanding': level_understanding[:, -1],
+        'level_understanding': level_understanding,
+        'mean_understanding': mean_understanding
     }
+    return apply_understanding(group, mean_understanding), trajectories
+
+def _prior_understanding(group: pd.DataFrame) -> np.ndarray:
+    """Starting understanding per student from their correct/elapsed_time stats.
     
-    return results, session
+    Half the student's accuracy, scaled by their pace relative to the group
+    median response time (clipped to 0.5-1.5x), so faster students with the
+    same accuracy start ahead.
+    """
+    accuracy = group['correct']['mean'].to_numpy(dtype=np.float64)
+    times = group['elapsed_time']['mean'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pace = np.nan_to_num(np.median(times) / times, nan=1.0, posinf=1.5)
+    return 0.5 * accuracy * np.clip(pace, 0.5, 1.5)
+
+def _simulate_chunk(prior_understanding: np.ndarray, seed: int) -> np.ndarray:
+    """Per-level understanding for one chunk of students, from its own seed."""
+    return simulate_understanding(len(prior_understanding), prior_understanding,
+                                  rng=np.random.default_rng(seed))
+
+def simulate_understanding(n_students: int,
+                           initial_understanding: Optional[np.ndarray] = None,
+                           rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Per-level blackboard understanding for each student's own trajectory.
+    
+    Follows the same level progression as ``_run_blackboard_session`` (3-4
+    interactions per level, each adding ``LearningInteraction.understanding_gain``)
+    for all students at once, without materializing events. Draws come from
+    ``rng`` when given, otherwise from the global NumPy RNG. Returns an
+    ``(n_students, len(LEARNING_LEVELS))`` array of the understanding reached
+    at the end of each level; the last column is the final understanding.
+    """
+    understanding = np.zeros(n_students)
+    if initial_understanding is not None:
+        understanding = np.asarray(initial_understanding, dtype=np.float64).copy()
+    
+    level_understanding = np.empty((n_students, len(LEARNING_LEVELS)))
+    for level_idx in range(len(LEARNING_LEVELS)):
+        n_interactions = (rng.integers(*INTERACTIONS_PER_LEVEL, size=n_students)
+                          if rng is not None
+                          else np.random.randint(*INTERACTIONS_PER_LEVEL, size=n_students))
+        for step in range(n_interactions.max(initial=0)):
+            active = step < n_interactions
+            understanding[active] = np.minimum(
+                1.0,
+                understanding[active]
+                + LearningInteraction.understanding_gain(understanding[active])
+            )
+        level_understanding[:, level_idx] = understanding
+    
+    return level_understanding
+
+def apply_understanding(group: pd.DataFrame, understanding) -> Dict[str, np.ndarray]:
+    """Calculate student outcomes from blackboard understanding.
+    
+    ``understanding`` is a scalar shared by the group or one value per
+    student; all outcomes are computed as whole-array operations.
+    """
+    understanding = np.broadcast_to(
+        np.asarray(understanding, dtype=np.float64), (len(group),)
+    )
+    base_scores = group['correct']['mean'].to_numpy(dtype=np.float64)
+    base_times = group['elapsed_time']['mean'].to_numpy(dtype=np.float64)
+    
+    # Apply understanding-based improvements
+    improvement = 1.0 + (understanding * 0.4)  # Up to 40% improvement
+    time_reduction = 1.0 - (understanding * 0.3)  # Up to 30% time reduction
+    
+    return {
+        'scores': base_scores * improvement,
+        'completion_rates': np.minimum(1.0, understanding * 1.2),
+        'time_to_mastery': base_times * time_reduction
+    }
 
 def save_all_results(output_path: Path,
                     pss_results: Dict,
@@ -151,9 +365,27 @@ if __name__ == "__main__":
                       help='Path to EdNet-KT1 dataset')
     parser.add_argument('--output_dir', type=str, default='results',
                       help='Output directory for results')
+    parser.add_argument('--replicates', type=int, default=None,
+                      help='Run this many seeded Monte Carlo replicates')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Worker processes for --replicates or --per_student_sessions '
+                           '(default: CPU count)')
+    parser.add_argument('--seed', type=int, default=None,
+                      help='Base seed for --replicates or --per_student_sessions')
+    parser.add_argument('--per_student_sessions', action='store_true',
+                      help='Simulate one blackboard trajectory per student')
     
     args = parser.parse_args()
-    results = run_minimal_prototype(args.ednet_path, args.output_dir)
+    if args.replicates:
+        results = run_monte_carlo(args.ednet_path, args.output_dir,
+                                  n_replicates=args.replicates,
+                                  n_workers=args.workers,
+                                  seed=args.seed)
+    else:
+        results = run_minimal_prototype(args.ednet_path, args.output_dir,
+                                        per_student_sessions=args.per_student_sessions,
+                                        n_workers=args.workers,
+                                        seed=args.seed)
     
     print("\nValidation Results:")
     print(json.dumps(convert_to_serializable(results), indent=2))
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import numpy as np
 import logging
 
@@ -19,13 +19,165 @@ class LearningEvent:
     student_response: Optional[str] = None
     understanding_depth: float = 0.0
 
+LEVEL_NAMES = ('observation', 'pattern', 'concept', 'principle')
+SOURCE_NAMES = ('socratic', 'constructivist', 'experiential')
+
+class EventLog:
+    """Struct-of-arrays storage for learning events.
+    
+    Events are kept in preallocated NumPy columns that double in capacity
+    when full: int64 timestamps (microseconds), int8 level and source codes,
+    int16 ids into a table of prompt/response texts and float32 confidence
+    and depth. Indexing and iteration return ``LearningEvent`` views built on
+    demand, so the log can stand in for a list of events; bulk consumers
+    should use the column properties or ``rows()`` instead.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, capacity)
+        self._size = 0
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._levels = np.empty(capacity, dtype=np.int8)
+        self._sources = np.empty(capacity, dtype=np.int8)
+        self._prompt_ids = np.empty(capacity, dtype=np.int16)
+        self._response_ids = np.empty(capacity, dtype=np.int16)
+        self._confidence = np.empty(capacity, dtype=np.float32)
+        self._depth = np.empty(capacity, dtype=np.float32)
+        # Interned prompt and response texts, shared by all events
+        self.texts: List[str] = []
+        self._text_ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[LearningEvent, List[LearningEvent]]:
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("event index out of range")
+        return self._event(index)
+    
+    def __iter__(self) -> Iterator[LearningEvent]:
+        return (self._event(i) for i in range(self._size))
+    
+    def append(self, event: LearningEvent) -> None:
+        """Store an event; later changes to the event object are not seen."""
+        if self._size == len(self._timestamps):
+            self._grow(2 * self._size)
+        
+        i = self._size
+        self._timestamps[i] = np.datetime64(event.timestamp, 'us').astype(np.int64)
+        self._levels[i] = LEVEL_NAMES.index(event.level)
+        self._sources[i] = SOURCE_NAMES.index(event.source)
+        self._prompt_ids[i] = self._intern(event.content)
+        self._response_ids[i] = (self._intern(event.student_response)
+                                 if event.student_response else -1)
+        self._confidence[i] = event.confidence
+        self._depth[i] = event.understanding_depth
+        self._size += 1
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._size].view('datetime64[us]')
+    
+    @property
+    def levels(self) -> np.ndarray:
+        """Level codes, indexing ``LEVEL_NAMES``."""
+        return self._levels[:self._size]
+    
+    @property
+    def sources(self) -> np.ndarray:
+        """Source codes, indexing ``SOURCE_NAMES``."""
+        return self._sources[:self._size]
+    
+    @property
+    def prompt_ids(self) -> np.ndarray:
+        """Prompt ids, indexing ``texts``."""
+        return self._prompt_ids[:self._size]
+    
+    @property
+    def response_ids(self) -> np.ndarray:
+        """Response ids, indexing ``texts``; -1 where there is no response."""
+        return self._response_ids[:self._size]
+    
+    @property
+    def confidence(self) -> np.ndarray:
+        return self._confidence[:self._size]
+    
+    @property
+    def understanding_depth(self) -> np.ndarray:
+        return self._depth[:self._size]
+    
+    def rows(self) -> Iterator[Tuple]:
+        """Plain tuples in ``LearningEvent`` field order, without building events."""
+        texts = self.texts + [None]  # response id -1 maps to None
+        return zip(
+            self.timestamps.astype(datetime).tolist(),
+            [LEVEL_NAMES[code] for code in self.levels.tolist()],
+            [SOURCE_NAMES[code] for code in self.sources.tolist()],
+            [texts[i] for i in self.prompt_ids.tolist()],
+            self.confidence.tolist(),
+            [texts[i] for i in self.response_ids.tolist()],
+            self.understanding_depth.tolist()
+        )
+    
+    def level_segments(self) -> Iterator[Tuple[str, int, int]]:
+        """(level, start, stop) for each run of consecutive events at one level."""
+        levels = self.levels
+        bounds = np.flatnonzero(np.diff(levels)) + 1
+        starts = np.concatenate([[0], bounds]) if self._size else bounds
+        stops = np.append(bounds, self._size)
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            yield LEVEL_NAMES[levels[start]], start, stop
+    
+    def _event(self, i: int) -> LearningEvent:
+        response_id = int(self._response_ids[i])
+        return LearningEvent(
+            timestamp=self._timestamps[i].astype('datetime64[us]').astype(datetime),
+            level=LEVEL_NAMES[self._levels[i]],
+            source=SOURCE_NAMES[self._sources[i]],
+            content=self.texts[self._prompt_ids[i]],
+            confidence=float(self._confidence[i]),
+            student_response=self.texts[response_id] if response_id >= 0 else None,
+            understanding_depth=float(self._depth[i])
+        )
+    
+    def _intern(self, text: str) -> int:
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = len(self.texts)
+            if text_id > np.iinfo(np.int16).max:
+                raise ValueError("EventLog supports at most 32767 distinct texts")
+            self.texts.append(str(text))
+            self._text_ids[text] = text_id
+        return text_id
+    
+    def _grow(self, capacity: int) -> None:
+        for name in ('_timestamps', '_levels', '_sources', '_prompt_ids',
+                     '_response_ids', '_confidence', '_depth'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
 @dataclass
 class BlackboardSession:
-    """Tracks a complete learning session."""
-    events: List[LearningEvent] = field(default_factory=list)
+    """Tracks a complete learning session.
+    
+    ``events`` is a plain list by default; ``BlackboardSession.columnar()``
+    stores them in a compact ``EventLog`` instead.
+    """
+    events: Union[List[LearningEvent], EventLog] = field(default_factory=list)
     current_level: str = "observation"
     topic_understanding: Dict[str, float] = field(default_factory=dict)
     
+    @classmethod
+    def columnar(cls, capacity: int = 64) -> 'BlackboardSession':
+        """Session backed by a struct-of-arrays ``EventLog``."""
+        return cls(events=EventLog(capacity))
+    
     def add_event(self, event: LearningEvent) -> None:
         self.events.append(event)
         self._update_understanding(event)
@@ -38,10 +190,36 @@ class BlackboardSession:
                 self.topic_understanding.get(event.level, 0) + event.understanding_depth
             )
 
+# Student response templates per understanding band
+RESPONSE_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    'low': (
+        "I'm not sure, but maybe...",
+        "This seems complicated...",
+        "I think I see something..."
+    ),
+    'medium': (
+        "I'm starting to see how...",
+        "This connects to...",
+        "It reminds me of..."
+    ),
+    'high': (
+        "This clearly shows...",
+        "I can apply this to...",
+        "The principle here is..."
+    )
+}
+
 class LearningInteraction:
-    """Manages learning interactions through the blackboard."""
+    """Manages learning interactions through the blackboard.
+    
+    Prompts are compiled once into per-level (source, prompts) tables.
+    Sampling draws an integer index from ``rng`` when one is given, or
+    otherwise from the global NumPy RNG, consuming it exactly as
+    ``np.random.choice`` over the prompt list would.
+    """
     
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng
         self.socratic_prompts = {
             'observation': [
                 "What do you notice about this concept?",
@@ -111,23 +289,24 @@ class LearningInteraction:
             ]
         }
         
+        # Knowledge source and prompts for each level
+        self.level_prompts: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+            level: (source, tuple(prompts[level]))
+            for level, (source, prompts) in (
+                ('observation', ('experiential', self.experiential_prompts)),
+                ('pattern', ('constructivist', self.constructivist_scaffolds)),
+                ('concept', ('socratic', self.socratic_prompts)),
+                ('principle', ('socratic', self.socratic_prompts))
+            )
+        }
+    
     def generate_event(self, 
                       level: str,
                       current_understanding: float) -> LearningEvent:
         """Generate appropriate learning event based on current state."""
-        # Choose knowledge source based on level and understanding
-        if level == "observation":
-            source = "experiential"
-            prompts = self.experiential_prompts
-        elif level == "pattern":
-            source = "constructivist"
-            prompts = self.constructivist_scaffolds
-        else:
-            source = "socratic"
-            prompts = self.socratic_prompts
-            
-        # Select appropriate prompt
-        content = np.random.choice(prompts[level])
+        # Choose knowledge source and select appropriate prompt
+        source, prompts = self.level_prompts[level]
+        content = prompts[self._draw(len(prompts))]
         
         # Generate confidence based on understanding
         confidence = min(0.9, 0.5 + current_understanding)
@@ -138,32 +317,18 @@ class LearningInteraction:
             source=source,
             content=content,
             confidence=confidence,
-            understanding_depth=0.1 + (0.2 * current_understanding)
+            understanding_depth=self.understanding_gain(current_understanding)
         )
+    
+    @staticmethod
+    def understanding_gain(understanding):
+        """Understanding added by one event; works on scalars and arrays."""
+        return 0.1 + (0.2 * understanding)
         
     def generate_response(self,
                          event: LearningEvent,
                          understanding: float) -> str:
         """Generate student response based on understanding level."""
-        # Response templates for different understanding levels
-        responses = {
-            'low': [
-                "I'm not sure, but maybe...",
-                "This seems complicated...",
-                "I think I see something..."
-            ],
-            'medium': [
-                "I'm starting to see how...",
-                "This connects to...",
-                "It reminds me of..."
-            ],
-            'high': [
-                "This clearly shows...",
-                "I can apply this to...",
-                "The principle here is..."
-            ]
-        }
-        
         # Select response level
         if understanding < 0.3:
             level = 'low'
@@ -172,4 +337,18 @@ class LearningInteraction:
         else:
             level = 'high'
             
-        return np.random.choice(responses[level])
\ No newline at end of file
+        responses = RESPONSE_TEMPLATES[level]
+        return responses[self._draw(len(responses))]
+    
+    def generate_prompts(self, level: str, n: int) -> List[str]:
+        """Draw ``n`` prompts for a level in one call."""
+        _, prompts = self.level_prompts[level]
+        indices = (self.rng.integers(len(prompts), size=n) if self.rng is not None
+                   else np.random.randint(len(prompts), size=n))
+        return [prompts[i] for i in indices.tolist()]
+    
+    def _draw(self, n_choices: int) -> int:
+        """Uniform index draw from the session RNG (or the global one)."""
+        if self.rng is not None:
+            return int(self.rng.integers(n_choices))
+        return np.random.randint(n_choices)
@@ -1,15 +1,23 @@
 # File: prototype/simulation/educational_discourse.py
 
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from pathlib import Path
+import json
 import logging
-from dataclasses import dataclass
+import pandas as pd
+from prototype.data.dataset_loader import ParquetChunkWriter
 from prototype.models.blackboard_core import BlackboardSystem, Hypothesis
 import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Loggers that emit on every turn; silenced in bulk generation workers
+HOT_PATH_LOGGERS = (__name__, 'prototype.models.blackboard_core')
+
 @dataclass
 class DiscourseContribution:
     speaker: str
@@ -42,7 +50,8 @@ class EducationalDiscourse:
         # Professor introduces topic
         opening = self._generate_opening()
         discourse.append(opening)
-        logger.info(f"Generated opening: {opening.content[:50]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Generated opening: {opening.content[:50]}...")
 
         # Add initial hypothesis to blackboard
         self.blackboard.add_hypothesis(
@@ -58,7 +67,8 @@ class EducationalDiscourse:
 
         # Generate discussion with turn limit and logging
         while not self._discussion_complete():
-            logger.info(f"Turn {self.current_turn + 1}: Depth = {self.discussion_depth:.2f}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Turn {self.current_turn + 1}: Depth = {self.discussion_depth:.2f}")
 
             # Get current understanding
             understanding = self.blackboard.get_current_understanding()
@@ -67,7 +77,8 @@ class EducationalDiscourse:
             contribution = self._generate_next_contribution(understanding)
             if contribution:
                 discourse.append(contribution)
-                logger.info(f"Generated contribution from {contribution.speaker}: {contribution.content[:50]}...")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Generated contribution from {contribution.speaker}: {contribution.content[:50]}...")
 
                 # Add new hypothesis based on contribution
                 self._add_contribution_hypothesis(contribution)
@@ -229,4 +240,81 @@ class EducationalDiscourse:
         if completed:
             logger.info("Discussion reached completion criteria")
 
-        return completed
\ No newline at end of file
+        return completed
+
+def generate_sessions(topics: Iterable[str],
+                      n_per_topic: int,
+                      output_path: str,
+                      workers: Optional[int] = None,
+                      seed: Optional[int] = None,
+                      chunk_size: int = 100) -> int:
+    """Generate many discourse sessions on a process pool and stream them to disk.
+    
+    Every session gets its own seed derived from ``seed``, so the output does
+    not depend on the number of workers. Per-turn logging is silenced in the
+    workers. Contributions are written as one record per line to
+    ``output_path`` (JSONL, or Parquet when the name ends in .parquet and
+    pyarrow is installed), chunk by chunk as sessions finish. Returns the
+    number of contributions written.
+    """
+    parquet = ParquetChunkWriter(output_path) if str(output_path).endswith('.parquet') else None
+    
+    session_topics = [topic for topic in topics for _ in range(n_per_topic)]
+    session_seeds = np.random.SeedSequence(seed).generate_state(len(session_topics))
+    tasks = [(session_id, topic, int(session_seed))
+             for session_id, (topic, session_seed) in enumerate(zip(session_topics, session_seeds))]
+    chunks = [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+    
+    logger.info(f"Generating {len(tasks)} discourse sessions in {len(chunks)} chunks...")
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    n_written = 0
+    
+    with parquet or open(output_path, 'w') as sink, \
+            ProcessPoolExecutor(max_workers=workers,
+                                initializer=_init_discourse_worker) as executor:
+        for records in executor.map(_generate_session_chunk, chunks):
+            if parquet is not None:
+                sink.write(pd.DataFrame.from_records(records))
+            else:
+                sink.writelines(json.dumps(record) + '\n' for record in records)
+            n_written += len(records)
+    
+    logger.info(f"Wrote {n_written} contributions to {output_path}")
+    return n_written
+
+def _init_discourse_worker() -> None:
+    """Silence per-turn logging in a bulk generation worker."""
+    for name in HOT_PATH_LOGGERS:
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+def _generate_session_chunk(tasks: List[Tuple[int, str, int]]) -> List[Dict]:
+    """Run one session per (session_id, topic, seed) task; return flat records."""
+    records = []
+    for session_id, topic, seed in tasks:
+        np.random.seed(seed)
+        discourse = EducationalDiscourse().generate_session(topic)
+        for turn, contribution in enumerate(discourse):
+            record = asdict(contribution)
+            record['timestamp'] = contribution.timestamp.isoformat()
+            records.append({'session_id': session_id, 'topic': topic, 'turn': turn, **record})
+    return records
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate synthetic educational discourse sessions')
+    parser.add_argument('--topics', nargs='+',
+                      default=['metacognition', 'critical_thinking', 'problem_solving'],
+                      help='Session topics')
+    parser.add_argument('--n_per_topic', type=int, default=100,
+                      help='Sessions to generate per topic')
+    parser.add_argument('--output_path', type=str, default='discourse_sessions.jsonl',
+                      help='Output .jsonl or .parquet file')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=None,
+                      help='Base seed for the session RNGs')
+    
+    args = parser.parse_args()
+    generate_sessions(args.topics, args.n_per_topic, args.output_path,
+                      workers=args.workers, seed=args.seed)
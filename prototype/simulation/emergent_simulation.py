@@ -8,6 +8,10 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Learning-process limits shared by the per-student and batched engines
+MASTERY_THRESHOLD = 0.95
+MAX_INTERACTIONS = 50
+
 class EmergentSimulation:
     """Implements AI-first simulation using emergent dynamics."""
     
@@ -16,8 +20,12 @@ class EmergentSimulation:
         self.current_state = None
         self.interaction_history = []
         
-    def run_session(self, student_group: pd.DataFrame) -> Dict:
-        """Run simulation for experimental group."""
+    def run_session(self, student_group: pd.DataFrame, batched: bool = False) -> Dict:
+        """Run simulation for experimental group.
+        
+        With ``batched`` all students advance together as NumPy arrays
+        (see ``_simulate_learning_batch``) instead of one at a time.
+        """
         logger.info("Starting emergent simulation session")
         
         # Initialize results storage
@@ -34,6 +42,21 @@ class EmergentSimulation:
             'avg_time': student_group['elapsed_time']['mean'].values
         }
         
+        if batched:
+            final_state = self._simulate_learning_batch(
+                initial_knowledge=student_data['initial_knowledge'],
+                avg_time=student_data['avg_time']
+            )
+            self.current_state = final_state
+            results['scores'] = final_state['knowledge'].tolist()
+            results['completion_rates'] = (
+                final_state['interactions'] / student_data['interaction_count']
+            ).tolist()
+            results['time_to_mastery'] = final_state['mastery_time'].tolist()
+            
+            logger.info(f"Completed batched simulation for {len(student_group)} students")
+            return results
+        
         # Run simulation for each student
         for i in range(len(student_group)):
             # Initialize student state
@@ -70,8 +93,8 @@ class EmergentSimulation:
         }
         
         # Continue until mastery or max interactions
-        while (state['knowledge'] < 0.95 and 
-               state['interactions'] < 50):  # Prevent infinite loops
+        while (state['knowledge'] < MASTERY_THRESHOLD and 
+               state['interactions'] < MAX_INTERACTIONS):  # Prevent infinite loops
             
             # Generate next interaction
             interaction = self._generate_interaction(state)
@@ -85,6 +108,47 @@ class EmergentSimulation:
             
         return state
     
+    def _simulate_learning_batch(self,
+                                 initial_knowledge: np.ndarray,
+                                 avg_time: np.ndarray) -> Dict[str, np.ndarray]:
+        """Simulate the learning process for all students at once.
+        
+        Applies the same dynamics as ``_simulate_learning_process`` to whole
+        arrays: each step updates only students still below mastery and the
+        interaction limit, and the loop stops once none remain.
+        """
+        knowledge = np.asarray(initial_knowledge, dtype=np.float64).copy()
+        avg_time = np.asarray(avg_time, dtype=np.float64)
+        interactions = np.zeros(len(knowledge), dtype=np.int64)
+        mastery_time = np.zeros(len(knowledge))
+        
+        # The concept part of the interaction embedding is fixed, so only its
+        # sum enters the mean over all embedding dimensions
+        concept_sum = float(np.sum(self.concept_space))
+        embedding_size = len(self.concept_space) + 3
+        
+        active = np.flatnonzero(knowledge < MASTERY_THRESHOLD)
+        while active.size:
+            exploration = np.random.random(active.size)
+            quality = np.tanh(
+                (concept_sum + knowledge[active] + interactions[active] / MAX_INTERACTIONS
+                 + exploration) / embedding_size
+            )
+            knowledge[active] = np.minimum(
+                1.0, knowledge[active] + 0.1 * quality * (1 - knowledge[active])
+            )
+            interactions[active] += 1
+            mastery_time[active] += avg_time[active] * (1 + np.random.normal(0, 0.1, active.size))
+            
+            active = active[(knowledge[active] < MASTERY_THRESHOLD) &
+                            (interactions[active] < MAX_INTERACTIONS)]
+        
+        return {
+            'knowledge': knowledge,
+            'interactions': interactions,
+            'mastery_time': mastery_time
+        }
+    
     def _generate_interaction(self, current_state: Dict) -> Dict:
         """Generate next interaction based on current state."""
         # Create current embedding
@@ -92,7 +156,7 @@ class EmergentSimulation:
             self.concept_space,
             np.array([
                 current_state['knowledge'],
-                current_state['interactions'] / 50,  # Normalized interaction count
+                current_state['interactions'] / MAX_INTERACTIONS,  # Normalized interaction count
                 np.random.random()  # Exploration factor
             ])
         ])
@@ -2,18 +2,25 @@
 
 from datetime import datetime
 from pathlib import Path
-import json
-from typing import List
+from typing import List, Optional
 import yaml
+from .blackboard_interaction import BlackboardSession, EventLog
 
 class TranscriptGenerator:
-    """Generates meaningful transcripts showing learning progression."""
-    
-    def __init__(self, config_path: str):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
-            
-    def generate_transcript(self, session, topic: str) -> str:
+    """Generates meaningful transcripts showing learning progression.
+
+    Events are read through the columnar ``EventLog`` accessors
+    (``level_segments()`` and ``rows()``), so no ``LearningEvent`` objects
+    are built; list-backed sessions are copied into an ``EventLog`` first.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
+        self.config = {}
+        if config_path is not None:
+            with open(config_path, 'r') as f:
+                self.config = yaml.safe_load(f)
+
+    def generate_transcript(self, session: BlackboardSession, topic: str) -> str:
         """Generate transcript with clear learning progression."""
         lines = [
             "================================================",
@@ -24,47 +31,68 @@ class TranscriptGenerator:
             "Learning Progression Analysis:",
             "------------------------------------------------\n"
         ]
-        
-        # Track conceptual development
-        current_level = None
-        concepts_mastered = set()
-        misconceptions_addressed = set()
-        
-        for event in session.events:
+
+        events = _as_event_log(session.events)
+        rows = list(events.rows())
+
+        for level, start, stop in events.level_segments():
             # Add level transition markers
-            if event.level != current_level:
-                current_level = event.level
-                lines.extend([
-                    f"\n[{current_level.title()} Level Development]",
-                    "------------------------------------------------\n"
-                ])
-            
-            # Format timestamp
-            timestamp = event.timestamp.strftime("%H:%M:%S")
-            
-            # Add detailed interaction with context
             lines.extend([
-                f"[{timestamp}] {event.source.title()} Knowledge Source:",
-                f"Context: {event.context.topic} (Difficulty: {event.context.difficulty:.2f})",
-                f"Focus: {event.context.current_concept}\n",
-                f"Q: {event.content}\n"
+                f"\n[{level.title()} Level Development]",
+                "------------------------------------------------\n"
             ])
-            
-            if event.student_response:
+
+            for timestamp, _, source, content, confidence, response, depth in rows[start:stop]:
                 lines.extend([
-                    "Student Response:",
-                    f"{event.student_response}\n",
-                    f"Understanding Gain: {event.understanding_depth:.2f}"
+                    f"[{timestamp.strftime('%H:%M:%S')}] {source.title()} Knowledge Source:",
+                    f"Confidence: {confidence:.2f}\n",
+                    f"Q: {content}\n"
                 ])
-                
-                # Track concept mastery
-                if event.understanding_depth > 0.7:
-                    concepts_mastered.add(event.context.current_concept)
-                
-                # Track addressed misconceptions
-                if event.misconceptions_addressed:
-                    misconceptions_addressed.update(event.misconceptions_addressed)
-            
-            lines.append("\n" + "-" * 48 + "\n")
-        
-        # Ad
\ No newline at end of file
+
+                if response:
+                    lines.extend([
+                        "Student Response:",
+                        f"{response}\n",
+                        f"Understanding Gain: {depth:.2f}"
+                    ])
+
+                lines.append("\n" + "-" * 48 + "\n")
+
+        lines.extend(self._summary(session))
+        return "\n".join(lines)
+
+    def save_transcript(self,
+                        session: BlackboardSession,
+                        topic: str,
+                        output_dir: Path) -> Path:
+        """Save session transcript to file."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        transcript_path = output_dir / f"session_transcript_{timestamp}.txt"
+        transcript_path.write_text(self.generate_transcript(session, topic))
+
+        return transcript_path
+
+    def _summary(self, session: BlackboardSession) -> List[str]:
+        """Understanding reached per level, with the configured key concepts."""
+        progression = self.config.get('learning_progression', {})
+        lines = [
+            "\nLearning Summary:",
+            "------------------------------------------------"
+        ]
+        for level, understanding in session.topic_understanding.items():
+            lines.append(f"{level.title()}: understanding {understanding:.2f}")
+            for concept in progression.get(level, {}).get('key_concepts', []):
+                lines.append(f"  - {concept}")
+        return lines
+
+def _as_event_log(events) -> EventLog:
+    """The events as an ``EventLog``, copying them if they are a plain list."""
+    if isinstance(events, EventLog):
+        return events
+    log = EventLog(len(events))
+    for event in events:
+        log.append(event)
+    return log
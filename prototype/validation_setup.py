@@ -8,6 +8,7 @@ import logging
 from sklearn.model_selection import train_test_split
 from scipy import stats
 import json
+from prototype.data.dataset_loader import load_interactions
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +41,7 @@ class ValidationFramework:
         logger.info("Setting up experimental validation")
         
         # Load EdNet Dataset
-        self.data = pd.read_csv(self.ednet_path)
-        logger.info(f"Loaded {len(self.data)} interactions from EdNet")
+        self.load_data()
         
         # Create matched groups
         self.control_group, self.experimental_group = self._create_matched_groups()
@@ -49,8 +49,18 @@ class ValidationFramework:
         
         return self.control_group, self.experimental_group
     
+    def load_data(self) -> pd.DataFrame:
+        """Load the EdNet interactions."""
+        self.data = load_interactions(self.ednet_path)
+        logger.info(f"Loaded {len(self.data)} interactions from EdNet")
+        return self.data
+    
     def _create_matched_groups(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Create matched control and experimental groups."""
+        return self.split_groups(self.student_statistics())
+    
+    def student_statistics(self) -> pd.DataFrame:
+        """Per-student correctness and timing statistics of the loaded data."""
         # Calculate student statistics
         student_stats = (self.data.groupby('user_id')
                         .agg({
@@ -59,8 +69,12 @@ class ValidationFramework:
                         }))
         
         # Reset index to make user_id a column
-        student_stats = student_stats.reset_index()
-        
+        return student_stats.reset_index()
+    
+    @staticmethod
+    def split_groups(student_stats: pd.DataFrame,
+                     random_state: int = 42) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split student statistics into control and experimental halves."""
         # Get proficiency scores with added noise to break ties
         proficiency = student_stats['correct']['mean'] + np.random.normal(0, 0.001, len(student_stats))
         
@@ -68,13 +82,16 @@ class ValidationFramework:
         control, experimental = train_test_split(
             student_stats,
             test_size=0.5,
-            random_state=42  # for reproducibility
+            random_state=random_state  # for reproducibility
         )
         
         return control, experimental
     
-    def run_validation(self, pss_results: Dict, traditional_results: Dict) -> Dict:
-        """Run validation analysis."""
+    def run_validation(self,
+                       pss_results: Dict,
+                       traditional_results: Dict,
+                       save: bool = True) -> Dict:
+        """Run validation analysis (written to validation_results.json if ``save``)."""
         logger.info("Running validation analysis")
         
         # Calculate metrics
@@ -100,7 +117,8 @@ class ValidationFramework:
         })
         
         # Save results
-        self._save_results(validation_results)
+        if save:
+            self._save_results(validation_results)
         
         return validation_results
     
@@ -0,0 +1,104 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prototype.data.ednet_analyzer import EdNetAnalyzer
+
+
+def _interactions(n_users: int = 30, n_rows: int = 600, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    users = rng.integers(n_users, size=n_rows)
+    data = pd.DataFrame({
+        'user_id': users,
+        'question_id': rng.integers(50, size=n_rows),
+        # Per-user skill makes tag accuracies correlate across users
+        'correct': (rng.random(n_rows) < rng.random(n_users)[users]).astype(int),
+        # Distinct and increasing, so each user's rows are already in time order
+        'elapsed_time': np.arange(1, n_rows + 1) * 10,
+        'knowledge_tag': rng.choice(['algebra', 'geometry', 'fractions', 'ratios', 'limits'],
+                                    size=n_rows)
+    })
+    # Constant accuracy on one tag and a tag only one user attempted
+    # exercise the undefined-correlation cases
+    data.loc[data['knowledge_tag'] == 'limits', 'correct'] = 1
+    data.loc[data['user_id'] == 0, 'knowledge_tag'] = data['knowledge_tag'].where(
+        rng.random(n_rows) < 0.5, 'vectors'
+    )
+    return data
+
+
+def _analyze(tmp_path, data: pd.DataFrame, name: str = 'interactions.csv') -> EdNetAnalyzer:
+    path = tmp_path / name
+    data.to_csv(path, index=False)
+    analyzer = EdNetAnalyzer(str(path))
+    analyzer.analyze_structure()
+    return analyzer
+
+
+def _per_pair_strengths(data: pd.DataFrame) -> dict:
+    """Prerequisite strengths as the original per-pair loop computed them."""
+    strengths = {}
+    tags = set(data['knowledge_tag'])
+    for tag in tags:
+        tag_users = set(data[data['knowledge_tag'] == tag]['user_id'])
+        for prereq in tags - {tag}:
+            prereq_success, tag_success = [], []
+            for user_id in tag_users:
+                user_data = data[data['user_id'] == user_id]
+                prereq_attempts = user_data[user_data['knowledge_tag'] == prereq]['correct']
+                tag_attempts = user_data[user_data['knowledge_tag'] == tag]['correct']
+                if len(prereq_attempts) and len(tag_attempts):
+                    prereq_success.append(prereq_attempts.mean())
+                    tag_success.append(tag_attempts.mean())
+            if prereq_success:
+                with warnings.catch_warnings():
+                    # Single-user and constant samples have no correlation
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    correlation = np.corrcoef(prereq_success, tag_success)[0, 1]
+                strengths.setdefault(tag, {})[prereq] = max(0, correlation)
+    return strengths
+
+
+def test_prerequisite_strengths_match_per_pair_loop(tmp_path):
+    data = _interactions()
+    analyzer = _analyze(tmp_path, data)
+
+    expected = _per_pair_strengths(data)
+    actual = {tag: dict(prereqs) for tag, prereqs in analyzer.prerequisite_strengths.items() if prereqs}
+    assert actual.keys() == expected.keys()
+    for tag, prereqs in expected.items():
+        assert actual[tag] == pytest.approx(prereqs, abs=1e-9)
+
+
+def _assert_nested_close(actual: dict, expected: dict) -> None:
+    actual = {key: dict(values) for key, values in actual.items() if values}
+    expected = {key: dict(values) for key, values in expected.items() if values}
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert actual[key] == pytest.approx(values, abs=1e-9)
+
+
+def test_update_matches_analyzing_the_combined_log(tmp_path):
+    data = _interactions()
+    # A student who only appears in the update
+    data.loc[data.index[-20:], 'user_id'] = 99
+    first, second = data.iloc[:400], data.iloc[400:]
+
+    updated = _analyze(tmp_path, first, 'first.csv')
+    structure = updated.update(second)
+    combined = _analyze(tmp_path, data, 'combined.csv')
+
+    _assert_nested_close(updated.success_rates, combined.success_rates)
+    _assert_nested_close(updated.concept_relationships, combined.concept_relationships)
+    _assert_nested_close(updated.prerequisite_strengths, combined.prerequisite_strengths)
+
+    expected = combined.structure
+    assert structure['concepts'].keys() == expected['concepts'].keys()
+    for tag, concept in expected['concepts'].items():
+        assert structure['concepts'][tag]['prerequisites'] == concept['prerequisites']
+        assert structure['concepts'][tag]['difficulty'] == pytest.approx(concept['difficulty'])
+    assert structure['relationships'].keys() == expected['relationships'].keys()
+    for key, relationship in expected['relationships'].items():
+        assert structure['relationships'][key]['strength'] == pytest.approx(relationship['strength'])
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prototype.data.ednet_sampler import EdNetSampler
+
+
+def _rolling_learning_rates(df: pd.DataFrame) -> list:
+    """Learning rates as the original per-student rolling-window loop computed them."""
+    learning_rates = []
+    for student in sorted(df['user_id'].unique()):
+        student_data = df[df['user_id'] == student]
+        if len(student_data) >= 2:
+            rolling_perf = student_data['correct'].rolling(5, min_periods=1).mean()
+            learning_rates.append(rolling_perf.iloc[-1] - rolling_perf.iloc[0])
+        else:
+            learning_rates.append(0)
+    return learning_rates
+
+
+def test_learning_rates_match_rolling_window_loop():
+    rng = np.random.default_rng(0)
+    # Interleaved rows of students with 1, a few, and many attempts
+    users = np.concatenate([[7], np.repeat([3, 11], 3), rng.choice([0, 5, 42], size=200)])
+    rng.shuffle(users)
+    df = pd.DataFrame({'user_id': users, 'correct': rng.integers(2, size=len(users))})
+
+    expected = _rolling_learning_rates(df)
+    assert EdNetSampler._calculate_learning_rates(df) == pytest.approx(expected)
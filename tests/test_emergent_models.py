@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from prototype.models.emergent_models import DynamicInteraction, EmergentSession
+
+
+def _interaction(pattern_id: int) -> DynamicInteraction:
+    return DynamicInteraction(
+        timestamp=datetime(2024, 1, 1),
+        embedding=np.ones(4),
+        quality=0.5,
+        patterns=[{'id': pattern_id, 'embedding': np.ones(4), 'strength': 1.0, 'coherence': 1.0}]
+    )
+
+
+@pytest.mark.parametrize('max_history', [0, -1])
+def test_max_history_below_one_is_rejected(max_history):
+    with pytest.raises(ValueError):
+        EmergentSession(id='s', timestamp=datetime(2024, 1, 1), max_history=max_history)
+
+
+def test_max_history_of_one_keeps_only_the_latest_state():
+    session = EmergentSession(id='s', timestamp=datetime(2024, 1, 1), max_history=1)
+    for pattern_id in range(3):
+        session.add_interaction(_interaction(pattern_id))
+
+    assert len(session.interactions) == 1
+    assert len(session.state_history) == 1
+    assert list(session.pattern_evolution) == [2]
+    assert session.quality_stats.count == 3
+
+
+def test_patterns_without_id_group_by_embedding():
+    session = EmergentSession(id='s', timestamp=datetime(2024, 1, 1))
+    for embedding in (np.ones(4), np.ones(4), np.arange(4.0)):
+        session.add_interaction(DynamicInteraction(
+            timestamp=datetime(2024, 1, 1),
+            embedding=np.ones(4),
+            quality=0.5,
+            patterns=[{'embedding': embedding, 'strength': 1.0, 'coherence': 1.0}]
+        ))
+
+    assert sorted(len(patterns) for patterns in session.pattern_evolution.values()) == [1, 2]
+
+
+@pytest.mark.parametrize('max_history', [None, 2])
+def test_complexity_metrics_match_recomputation_after_evolve(max_history):
+    rng = np.random.default_rng(0)
+    session = EmergentSession(id='s', timestamp=datetime(2024, 1, 1), max_history=max_history)
+    dropped = []
+    for _ in range(5):
+        if max_history is not None and len(session.state_history) == max_history:
+            dropped.append(session.state_history[0].complexity)
+        session.add_interaction(DynamicInteraction(
+            timestamp=datetime(2024, 1, 1),
+            embedding=np.ones(4),
+            quality=0.5,
+            patterns=[{'id': i, 'embedding': rng.standard_normal(4), 'strength': 1.0, 'coherence': 1.0}
+                      for i in range(3)]
+        ))
+
+    for pattern in session.state_history[-1].active_patterns:
+        pattern.evolve(rng.standard_normal(4), learning_rate=1.0)
+
+    complexities = dropped + [state.complexity for state in session.state_history]
+    metrics = session.get_session_metrics()
+    assert metrics['complexity'] == pytest.approx(np.mean(complexities))
+    assert metrics['complexity_variance'] == pytest.approx(np.var(complexities))